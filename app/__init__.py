@@ -3,6 +3,10 @@ from typing import Type
 from flask import Flask
 from config import Config, DeploymentConfig
 from .extensions import db, migrate
+from . import caching
+from .services.data import frame_cache
+from .services.plots import render_cache, render_pool
+from .jobs import job_queue
 from flask_moment import Moment
 moment = Moment()
 
@@ -14,6 +18,11 @@ def create_app(configuration: Type[Config]) -> Flask:
     db.init_app(app)
     migrate.init_app(app, db)
     moment.init_app(app)
+    frame_cache.init_app(app)
+    render_cache.init_app(app)
+    render_pool.init_app(app)
+    job_queue.init_app(app)
+    caching.init_app(app)
 
     with app.app_context():
         from app.models import User, File, Chart, SharedFile, SharedChart, Friend, Notification
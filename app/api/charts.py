@@ -1,10 +1,11 @@
-import json, os, uuid, pandas as pd
+import json
 from flask import Blueprint, jsonify, request, session, abort, current_app, url_for
-from app.models import Chart, File
+from app.models import Chart, File, RenderJob
+from app.caching import revalidated_json
 from app.extensions import db
-from app.services import registry, read_csv
-from app.services.plots import save_figure_to_file
-from .utils import require_login, get_user, UPLOADS_FOLDER
+from app.jobs import job_queue, render_chart_image
+from app.services import BindError, ColumnError, remove_image_files
+from .utils import require_login, get_user
 from sqlalchemy.exc import SQLAlchemyError
 
 charts = Blueprint('charts', __name__, url_prefix='/charts')
@@ -13,13 +14,13 @@ charts = Blueprint('charts', __name__, url_prefix='/charts')
 @require_login
 def list_charts():
     charts = Chart.query.filter_by(owner_id=get_user()).all()
-    return jsonify([
+    return revalidated_json([
         {
             'id':         c.id,
             'name':       c.name,
             'spec':       c.spec,
             'file_id':    c.file_id,
-            'image_url':  url_for('static', filename=c.image_path.replace('static/', '')) if c.image_path else None
+            'image_url':  c.image_url
         }
         for c in charts
     ])
@@ -32,16 +33,21 @@ def create_chart():
 
     if not (name and file_id and spec):
         abort(400, description="Missing required fields.")
+    if (invalid := _invalid_spec(spec, file_id)) is not None:
+        return invalid
 
     new_chart = Chart(name=name, file_id=file_id, spec=spec, owner_id=get_user())
     db.session.add(new_chart)
     db.session.commit()
 
+    if _respond_async():
+        return _accepted(new_chart)
+
     _generate_and_store_image(new_chart)
 
     return jsonify({
         'id':         new_chart.id,
-        'image_url':  url_for('static', filename=new_chart.image_path.replace('static/', '')) if new_chart.image_path else None
+        'image_url':  new_chart.image_url
     }), 201
 
 @charts.route('/<int:chart_id>', methods=['PATCH'])
@@ -50,17 +56,22 @@ def update_chart(chart_id):
     chart = Chart.query.filter_by(id=chart_id, owner_id=get_user()).first_or_404()
 
     data = request.get_json()
+    if 'spec' in data and (invalid := _invalid_spec(data['spec'], chart.file_id)) is not None:
+        return invalid
     chart.name = data.get('name', chart.name)
     chart.spec = data.get('spec', chart.spec)
     db.session.commit()
 
+    if _respond_async():
+        return _accepted(chart)
+
     _generate_and_store_image(chart)
 
     return jsonify({
         'id':         chart.id,
         'name':       chart.name,
         'spec':       chart.spec,
-        'image_url':  url_for('static', filename=chart.image_path.replace('static/', '')) if chart.image_path else None
+        'image_url':  chart.image_url
     })
 
 @charts.route('/<int:chart_id>', methods=['DELETE'])
@@ -68,36 +79,94 @@ def update_chart(chart_id):
 def delete_chart(chart_id):
     chart = Chart.query.filter_by(id=chart_id, owner_id=get_user()).first_or_404()
 
-    # Delete associated image file
-    if chart.image_path and os.path.exists(chart.image_path):
-        os.remove(chart.image_path)
+    # Delete associated image files
+    if chart.image_path:
+        remove_image_files(chart.image_path)
 
     db.session.delete(chart)
     db.session.commit()
 
     return jsonify({'message': 'Chart deleted successfully.'})
 
-def _generate_and_store_image(chart: Chart):
-    try:
-        file = File.query.get_or_404(chart.file_id)
-        path_to_csv = os.path.join(UPLOADS_FOLDER, f'{file.id}.csv')
-        df = pd.read_csv(path_to_csv)
-
-        spec = json.loads(chart.spec)
-        graph_type = spec.get('graph_type')
-        spec['source'] = df
+@charts.route('/jobs/<int:job_id>', methods=['GET'])
+@require_login
+def get_job(job_id):
+    job = RenderJob.query.join(Chart).filter(RenderJob.id == job_id, Chart.owner_id == get_user()).first_or_404()
+    return jsonify(_job_json(job))
 
-        bound, _ = registry.functions[graph_type].bind_args(**spec)
-        fig = registry.functions[graph_type].function(**bound)
+@charts.route('/jobs/batches/<batch>', methods=['GET'])
+@require_login
+def get_batch(batch):
+    # the progress of jobs submitted together, like the charts redrawn after a file is replaced
+    jobs = (RenderJob.query.join(Chart).join(File, Chart.file_id == File.id)
+            .filter(RenderJob.batch == batch, db.or_(Chart.owner_id == get_user(), File.owner_id == get_user()))
+            .order_by(RenderJob.id).all())
+    if not jobs:
+        abort(404)
+    return jsonify(_batch_json(batch, jobs))
+
+def _invalid_spec(spec: str, file_id: int):
+    # specs are bound and their columns checked against the file's profile before they're saved, so a bad one is
+    # turned away here rather than failing part way through drawing it. gives back the response to send if it's invalid
+    from app.services import registry
 
-        # Remove old image file if it exists
-        if chart.image_path and os.path.exists(chart.image_path):
-            os.remove(chart.image_path)
+    try:
+        spec = json.loads(spec)
+    except (TypeError, ValueError):
+        abort(400, description="The spec must be a json object.")
+    if not isinstance(spec, dict) or (plotter := registry.functions.get(spec.get('graph_type'))) is None:
+        abort(400, description="Unknown chart type.")
 
-        # Save new image file and update path
-        chart.image_path = save_figure_to_file(fig, chart.id)
-        db.session.commit()
+    try:
+        plotter.bind_args(source=None, **{name: value for name, value in spec.items()
+                                          if name not in ('graph_type', 'source')})
+        file = db.session.get(File, file_id)
+        if file and (profile := file.profile):
+            plotter.check_columns(spec, profile.kinds, profile.cardinalities)
+    except BindError as e:
+        response = jsonify({'error': 'Invalid spec.', 'details': e.missing() + e.errors()})
+        response.status_code = 400
+        return response
+    except ColumnError as e:
+        response = jsonify({'error': 'Invalid spec.', 'details': e.problems})
+        response.status_code = 400
+        return response
+    return None
+
+def _respond_async() -> bool:
+    # clients opt in to getting a job back instead of waiting for the image (RFC 7240)
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+def _accepted(chart: Chart):
+    job = job_queue.submit(chart)
+    response = jsonify({'id': chart.id, **_job_json(job)})
+    response.status_code = 202
+    response.headers['Location'] = url_for('api.charts.get_job', job_id=job.id)
+    return response
+
+def _batch_json(batch: str, jobs: list[RenderJob]) -> dict:
+    counts = {status: sum(job.status == status for job in jobs)
+              for status in (RenderJob.QUEUED, RenderJob.RUNNING, RenderJob.DONE, RenderJob.FAILED)}
+    return {
+        'batch':    batch,
+        'total':    len(jobs),
+        **counts,
+        'finished': counts[RenderJob.DONE] + counts[RenderJob.FAILED] == len(jobs),
+        'jobs':     [_job_json(job) for job in jobs],
+    }
+
+def _job_json(job: RenderJob) -> dict:
+    return {
+        'job_id':    job.id,
+        'chart_id':  job.chart_id,
+        'status':    job.status,
+        'error':     job.error,
+        'image_url': job.chart.image_url if job.status == RenderJob.DONE else None,
+    }
 
+def _generate_and_store_image(chart: Chart):
+    try:
+        render_chart_image(chart)
     except (FileNotFoundError, SQLAlchemyError, Exception) as e:
         db.session.rollback()
-        raise RuntimeError(f"Failed to generate chart image: {e}")
\ No newline at end of file
+        raise RuntimeError(f"Failed to generate chart image: {e}")
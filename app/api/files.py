@@ -1,10 +1,14 @@
-from os import path, remove
+from os import path
 
-from flask import Blueprint, Response, abort, jsonify, request
+from flask import Blueprint, Response, abort, current_app, jsonify, request, send_file, url_for
+from werkzeug.datastructures import FileStorage
 
-from ..models import File
+from ..caching import revalidated_json
+from ..models import File, DataProfile
 from ..extensions import db
-from .utils import require_login, get_user, UPLOADS_FOLDER
+from ..jobs import job_queue
+from ..services import BindError, ColumnError, UploadError, UploadTooLarge, store_blob
+from .utils import require_login, get_user
 
 
 files = Blueprint('files', __name__, url_prefix='/files')
@@ -14,7 +18,7 @@ files = Blueprint('files', __name__, url_prefix='/files')
 @require_login
 def get_all_files() -> Response:
     files = File.query.filter_by(owner_id=get_user()).all()
-    return jsonify([{'id': file.id, 'name': file.name} for file in files])
+    return revalidated_json([{'id': file.id, 'name': file.name} for file in files])
 
 
 @files.route('/', methods=["POST"])
@@ -27,20 +31,20 @@ def make_new_file() -> Response:
         abort(400, description="Missing required fields.")
 
     try:
-        new_file = File(name=name, owner_id=get_user()) # type: ignore
+        key = _store_upload(file)
+        new_file = File(name=name, owner_id=get_user(), storage_key=key) # type: ignore
         db.session.add(new_file)
         db.session.commit()
-
-        file_name = f"{new_file.id}.csv"
-        file_path = path.join(UPLOADS_FOLDER, file_name)
-
-        file.save(file_path)
+        _ingest(new_file)
 
         response = jsonify({'id': new_file.id})
         response.status_code = 201
 
         return response
 
+    except UploadError as e:
+        return _upload_error(e)
+
     except Exception:
         db.session.rollback()
         response = jsonify({'error': 'Internal server error.'})
@@ -56,16 +60,18 @@ def get_file(file_id: int) -> Response:
     if file.owner_id != get_user() and not any(share.user_id == get_user() for share in file.shared_with):
         abort(403, description="You do not have access to this file.")
 
-    file_path = path.join(UPLOADS_FOLDER, f"{file_id}.csv")
-    if not path.exists(file_path):
+    file_path = file.storage_path
+    if not (file_path and path.exists(file_path)):
         response = jsonify({'error': 'File content is missing.'})
         response.status_code = 404
         return response
 
     try:
-        with open(file_path, "r") as file:
-            content = file.read()
-        return Response(content, mimetype='text/csv')
+        # send_file streams from disk and answers Range and conditional requests itself. content addressed
+        # uploads use their hash as a strong etag, older ones fall back to one made from the file's stat
+        response = send_file(file_path, mimetype='text/csv', conditional=True, etag=file.content_hash or True)
+        response.cache_control.private = True
+        return response
 
     except Exception:
         response = jsonify({'error': 'Internal server error.'})
@@ -84,12 +90,29 @@ def edit_file(file_id: int) -> Response:
     try:
         if new_name:
             file.name = new_name
+        old_key, old_path = file.storage_key, file.storage_path
         if new_file:
-            file_path = path.join(UPLOADS_FOLDER, f"{file_id}.csv")
-            new_file.save(file_path)
+            file.storage_key = _store_upload(new_file)
 
         db.session.commit()
-        return jsonify({'message': 'File updated successfully.'})
+
+        response = {'message': 'File updated successfully.'}
+        if new_file:
+            _ingest(file)
+            if old_key and old_key != file.storage_key and not File.reference_count(old_key):
+                _release(old_key, old_path)
+
+            # every chart drawn from the file is redrawn from its new content. ingesting it has already parsed it
+            # into the frame cache and its column sidecar, so the renders share that rather than each reading the csv
+            if file.storage_key != old_key and file.charts:
+                batch = job_queue.submit_all(file.charts)
+                response['renders'] = url_for('api.charts.get_batch', batch=batch)
+
+        return jsonify(response)
+
+    except UploadError as e:
+        db.session.rollback()
+        return _upload_error(e)
 
     except Exception:
         db.session.rollback()
@@ -105,15 +128,15 @@ def edit_file(file_id: int) -> Response:
 def delete_file(file_id: int) -> Response:
     file = File.query.filter_by(id=file_id, owner_id=get_user()).first_or_404()
 
-    file_path = path.join(UPLOADS_FOLDER, f"{file_id}.csv")
+    key, file_path = file.storage_key, file.storage_path
 
     try:
-        if path.exists(file_path):
-            remove(file_path)
-
         db.session.delete(file)
         db.session.commit()
 
+        if key and not File.reference_count(key):
+            _release(key, file_path)
+
         return jsonify({'message': 'File deleted successfully.'})
 
     except Exception:
@@ -123,3 +146,79 @@ def delete_file(file_id: int) -> Response:
         response.status_code = 500
         return response
 
+
+@files.route('/<int:file_id>/series', methods=["POST"])
+@require_login
+def get_series(file_id: int) -> Response:
+    # the data a chart spec would draw, for the browser to draw itself. asking for application/octet-stream gives
+    # every series packed as little endian float32, in the order named by the X-Series header
+    file = File.query.get_or_404(file_id)
+
+    if file.owner_id != get_user() and not any(share.user_id == get_user() for share in file.shared_with):
+        abort(403, description="You do not have access to this file.")
+
+    if not (file.storage_path and path.exists(file.storage_path)):
+        response = jsonify({'error': 'File content is missing.'})
+        response.status_code = 404
+        return response
+
+    spec = request.get_json(silent=True)
+    if not isinstance(spec, dict) or not spec.get('graph_type'):
+        abort(400, description="A spec with a graph_type is required.")
+
+    # pandas is only imported once something actually reads a file, see services/plots/__init__.py
+    from ..services.plots import pack_series, series_for_spec, series_to_json
+
+    try:
+        profile = file.profile
+        arrays, options = series_for_spec(spec['graph_type'], spec, file.storage_key, file.storage_path,
+                                          kinds=profile.kinds if profile else None)
+    except BindError as e:
+        response = jsonify({'error': 'Invalid spec.', 'details': e.missing() + e.errors()})
+        response.status_code = 400
+        return response
+    except ColumnError as e:
+        response = jsonify({'error': 'Invalid spec.', 'details': e.problems})
+        response.status_code = 400
+        return response
+    except KeyError as e:
+        abort(400, description=f"Unknown chart type or column {e.args[0]!r}.")
+    except (TypeError, ValueError) as e:
+        abort(400, description=str(e))
+
+    if request.accept_mimetypes.best_match(['application/json', 'application/octet-stream']) == 'application/octet-stream':
+        packed = pack_series(arrays)
+        if packed is None:
+            abort(406, description="Only numeric series can be sent as binary.")
+        response = Response(packed, mimetype='application/octet-stream')
+        response.headers['X-Series'] = ','.join(f"{name}:{len(values)}" for name, values in arrays.items())
+        return response
+
+    return jsonify({'graph_type': spec['graph_type'], 'options': options, 'series': series_to_json(arrays)})
+
+
+def _store_upload(upload: FileStorage) -> str:
+    return store_blob(
+        upload.stream,
+        current_app.config['UPLOADS_FOLDER'],
+        max_bytes=current_app.config['MAX_UPLOAD_BYTES'],
+        chunk_size=current_app.config['UPLOAD_CHUNK_BYTES'],
+    )
+
+
+def _upload_error(error: UploadError) -> Response:
+    response = jsonify({'error': str(error)})
+    response.status_code = 413 if isinstance(error, UploadTooLarge) else 400
+    return response
+
+
+def _ingest(file: File) -> None:
+    from ..services import ensure_profile
+    ensure_profile(file)
+
+
+def _release(key: str, file_path: str) -> None:
+    from ..services import discard
+    DataProfile.remove(key)
+    db.session.commit()
+    discard(key, file_path)
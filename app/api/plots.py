@@ -1,6 +1,4 @@
-from flask import Blueprint, Response, abort, jsonify
-
-from ..services import registry
+from flask import Blueprint, Response, abort, jsonify, request
 
 
 plots = Blueprint('plots', __name__, url_prefix='/plots')
@@ -8,11 +6,14 @@ plots = Blueprint('plots', __name__, url_prefix='/plots')
 
 @plots.route('/', methods=["GET"])
 def get_plots() -> Response:
+    # the registry is filled in by importing the plotters, which pulls in matplotlib, so it's left until it's needed
+    from ..services import registry
     return jsonify(registry.list_plots())
 
 
 @plots.route('/<plot>/', methods=["GET"])
 def get_plot(plot: str) -> Response:
+    from ..services import registry
     if plot == 'common':
         return jsonify(registry.list_common_args())
 
@@ -20,5 +21,11 @@ def get_plot(plot: str) -> Response:
     if not plotter:
         abort(404, description="Invalid chart type.")
 
+    # clients asking for a json schema get one they can check their specs against before sending them
+    if request.accept_mimetypes.best_match(['application/json', 'application/schema+json']) == 'application/schema+json':
+        response = jsonify(plotter.schema(plot))
+        response.mimetype = 'application/schema+json'
+        return response
+
     return jsonify(plotter.list_args())
 
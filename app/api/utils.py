@@ -1,12 +1,9 @@
-from os import path
 from functools import wraps
 from typing import Callable
 
 from flask import session, jsonify
 
 
-UPLOADS_FOLDER = path.join("app", "uploads")
-
 def require_login(function: Callable) -> Callable:
     @wraps(function)
     def inner(*args, **kwargs):
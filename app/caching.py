@@ -0,0 +1,48 @@
+from re import fullmatch
+from typing import Any
+
+from flask import Flask, Response, jsonify, request
+
+
+# chart images are saved under a hash of their contents, so a url always refers to the same image and browsers can
+# keep it for as long as they like
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CHART_IMAGE = r'chart_images/chart_\d+_[0-9a-f]{8,}(_\d+w)?\.(png|webp|svg)'
+
+
+def init_app(app: Flask) -> None:
+    app.after_request(_cache_chart_images)
+
+
+def no_store(response: Response) -> Response:
+    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
+    response.headers['Pragma'] = 'no-cache'
+    response.headers['Expires'] = '-1'
+    return response
+
+
+def immutable(response: Response) -> Response:
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    response.expires = None
+    return response
+
+
+def revalidated_json(payload: Any) -> Response:
+    # for per user listings. browsers keep a copy but check back every time, getting a 304 if nothing changed.
+    # the etag is weak since it's made from our serialisation of the data rather than the data itself
+    response = jsonify(payload)
+    response.add_etag(weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response.make_conditional(request)
+
+
+def _cache_chart_images(response: Response) -> Response:
+    filename = (request.view_args or {}).get('filename', '')
+    if request.endpoint == 'static' and response.status_code in (200, 206, 304) and fullmatch(CHART_IMAGE, filename):
+        immutable(response)
+    return response
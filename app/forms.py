@@ -43,6 +43,19 @@ class ChartForm(FlaskForm):
     x_col = SelectField('X Axis', choices=[('', '– Select X –')], validate_choice=False)
     y_col = SelectField('Y Axis', choices=[('', '– Select Y –')], validate_choice=False)
     column = SelectField('Column', choices=[('', '– Select column –')], validate_choice=False)
+    facet_by = SelectField('Facet By', choices=[('', '– None –')], validate_choice=False)
+    group_by = SelectField('Group By', choices=[('', '– None –')], validate_choice=False)
+    agg      = SelectField(
+        'Aggregate',
+        choices=[('', '– None –'), ('sum','Sum'), ('mean','Mean'), ('count','Count'), ('min','Min'), ('max','Max')],
+        validators=[Optional()]
+    )
+    resample = SelectField(
+        'Resample',
+        choices=[('', '– None –'), ('hour','Hourly'), ('day','Daily'), ('week','Weekly'), ('month','Monthly'),
+                 ('quarter','Quarterly'), ('year','Yearly')],
+        validators=[Optional()]
+    )
 
     # Optional Common Fields
     title   = StringField('Title',           validators=[Optional()])
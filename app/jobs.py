@@ -0,0 +1,152 @@
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from queue import Queue
+from threading import Lock, Thread
+from uuid import uuid4
+
+from flask import Flask, current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from .extensions import db
+from .models import Chart, File, RenderJob
+from .services import PlotJob, remove_image_files, render_pool, save_image_to_file
+
+
+def render_chart_image(chart: Chart) -> None:
+    file = db.session.get(File, chart.file_id)
+    if file is None:
+        raise FileNotFoundError(f"Chart {chart.id} has no file to draw from.")
+
+    spec = json.loads(chart.spec)
+    job = PlotJob(spec.get('graph_type'), spec, file.storage_key, file.storage_path,
+                  chunked_above=current_app.config['CHUNKED_RENDER_BYTES'])
+    image = render_pool.render(job)
+    svg = render_pool.render(replace(job, format='svg')) if current_app.config['CHART_SVG'] else None
+
+    # Remove old image files if they exist
+    if chart.image_path:
+        remove_image_files(chart.image_path)
+
+    # Save new image files and update path
+    chart.image_path = save_image_to_file(image, chart.id, svg=svg)
+    db.session.commit()
+
+
+class JobQueue:
+    inline: bool # runs jobs as they are submitted rather than on the queue's threads, as the tests do
+    threads: int # the number of jobs run at once
+
+    def __init__(self) -> None:
+        self.inline = False
+        self.threads = 1
+        self._app: Flask | None = None
+        self._queue: Queue[int] = Queue()
+        self._workers: list[Thread] = []
+        self._lock = Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self.inline = app.config.get('RENDER_JOBS_INLINE', self.inline)
+        self.threads = app.config.get('RENDER_JOB_THREADS', self.threads)
+        # the threads start with the first request rather than here, since the tables may not exist yet
+        app.before_request(self.start)
+
+    def submit(self, chart: Chart) -> RenderJob:
+        job = RenderJob(chart_id=chart.id)
+        db.session.add(job)
+        db.session.commit()
+        self._dispatch([job.id])
+        return job
+
+    def submit_all(self, charts: list[Chart]) -> str:
+        # one job per chart, sharing a batch so their progress can be followed together. the queue's threads
+        # pick them up side by side, so they're spread across the render workers
+        batch = uuid4().hex
+        jobs = [RenderJob(chart_id=chart.id, batch=batch) for chart in charts]
+        db.session.add_all(jobs)
+        db.session.commit()
+        self._dispatch([job.id for job in jobs])
+        return batch
+
+    def start(self) -> None:
+        if self.inline:
+            return
+        with self._lock:
+            while len(self._workers) < max(self.threads, 1):
+                # only the first thread looks for jobs left behind by a previous process
+                worker = Thread(target=self._work, args=(not self._workers,), name='render-jobs', daemon=True)
+                self._workers.append(worker)
+                worker.start()
+
+    def run(self, job_id: int) -> None:
+        # claims the job before running it, so that a job is never picked up by two processes at once
+        claimed = db.session.execute(
+            db.update(RenderJob)
+            .where(RenderJob.id == job_id, RenderJob.status == RenderJob.QUEUED)
+            .values(status=RenderJob.RUNNING, started_at=datetime.now(timezone.utc))
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return
+
+        job = db.session.get(RenderJob, job_id)
+        try:
+            render_chart_image(job.chart)
+            job.finish()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Render job {job_id} failed: {e}")
+            job = db.session.get(RenderJob, job_id)
+            job.finish(error=str(e))
+        db.session.commit()
+
+    def _dispatch(self, job_ids: list[int]) -> None:
+        if self.inline:
+            for job_id in job_ids:
+                self.run(job_id)
+            return
+        self.start()
+        for job_id in job_ids:
+            self._queue.put(job_id)
+
+    def _work(self, recover: bool) -> None:
+        if recover:
+            with self._app.app_context():
+                self._recover()
+                db.session.remove()
+
+        while True:
+            job_id = self._queue.get()
+            with self._app.app_context():
+                try:
+                    self.run(job_id)
+                except SQLAlchemyError as e:
+                    current_app.logger.error(f"Render job {job_id} could not be run: {e}")
+                finally:
+                    db.session.remove()
+
+    def _recover(self) -> None:
+        # jobs left queued by a previous process are picked back up. running jobs are only taken over once they have
+        # been running for longer than any render may take, since their process must have died part way through
+        stale = datetime.now(timezone.utc) - timedelta(seconds=2 * current_app.config.get('RENDER_TIMEOUT', 60))
+        try:
+            db.session.execute(
+                db.update(RenderJob)
+                .where(RenderJob.status == RenderJob.RUNNING, RenderJob.started_at < stale)
+                .values(status=RenderJob.QUEUED)
+            )
+            db.session.commit()
+            pending = db.session.scalars(
+                db.select(RenderJob.id).where(RenderJob.status == RenderJob.QUEUED).order_by(RenderJob.id)
+            ).all()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.error(f"Could not recover render jobs: {e}")
+            return
+
+        for job_id in pending:
+            self._queue.put(job_id)
+
+
+job_queue = JobQueue()
@@ -5,3 +5,5 @@ from .associations import SharedFile, SharedChart
 from .friend import Friend
 from .shared_data import SharedData
 from .notification import Notification
+from .profile import DataProfile, ColumnProfile
+from .render_job import RenderJob
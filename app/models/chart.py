@@ -1,5 +1,8 @@
-from flask import url_for
+from os import path
+
+from flask import current_app, url_for
 from ..extensions import db
+from ..services.plots import image_name, image_width
 from .base import Base
 
 class Chart(Base):
@@ -16,9 +19,34 @@ class Chart(Base):
     file         = db.relationship('File', back_populates='charts')
     shared_with  = db.relationship('SharedChart', back_populates='chart',
                                    cascade='all, delete-orphan')
+    render_jobs  = db.relationship('RenderJob', back_populates='chart',
+                                   cascade='all, delete-orphan')
 
     @property
     def image_url(self):
         if not self.image_path:
             return None
-        return url_for('static', filename=f'chart_images/{self.image_path}')
\ No newline at end of file
+        return url_for('static', filename=f'chart_images/{self.image_path}')
+
+    def image_src(self, format: str = 'png', width: int | None = None) -> str | None:
+        # the url of one rendition of the image, if it was saved
+        if not self.image_path:
+            return None
+        fname = image_name(self.image_path, width, format)
+        if not path.exists(path.join(current_app.config['IMAGE_FOLDER'], fname)):
+            return None
+        return url_for('static', filename=f'chart_images/{fname}')
+
+    def image_srcset(self, format: str = 'png') -> str:
+        # every size the image was saved at, for templates to offer as a srcset. charts saved before thumbnails
+        # were made just list the full image
+        if not self.image_path:
+            return ''
+        full_width = image_width(path.join(current_app.config['IMAGE_FOLDER'], self.image_path))
+        candidates = [
+            (src, width) for width in current_app.config['CHART_THUMBNAIL_WIDTHS']
+            if (full_width is None or width < full_width) and (src := self.image_src(format, width))
+        ]
+        if full_width and (src := self.image_src(format)):
+            candidates.append((src, full_width))
+        return ', '.join(f"{src} {width}w" for src, width in candidates)
\ No newline at end of file
@@ -1,5 +1,11 @@
+from os import path
+
+from flask import current_app
+
 from ..extensions import db
+from ..services import blob_digest
 from .base import Base
+from .profile import DataProfile
 
 class File(Base):
     __tablename__ = 'files'
@@ -7,6 +13,10 @@ class File(Base):
     name     = db.Column(db.String(255), nullable=False)
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    # the name of the upload within UPLOADS_FOLDER. uploads are stored by content hash, so identical
+    # uploads share a key and the blob is only removed once no file refers to it
+    storage_key = db.Column(db.String(255), nullable=True, index=True)
+
     # relationship back to User
     owner = db.relationship('User', back_populates='files')
 
@@ -15,3 +25,22 @@ class File(Base):
 
     # and be shared to many users
     shared_with = db.relationship('SharedFile', back_populates='file', cascade='all, delete-orphan')
+
+    @staticmethod
+    def reference_count(storage_key: str) -> int:
+        return File.query.filter_by(storage_key=storage_key).count()
+
+    @property
+    def profile(self) -> DataProfile | None:
+        # recorded when the upload is ingested, see services/profiles.py
+        return DataProfile.query.filter_by(storage_key=self.storage_key).first()
+
+    @property
+    def content_hash(self) -> str | None:
+        return blob_digest(self.storage_key)
+
+    @property
+    def storage_path(self) -> str | None:
+        if not self.storage_key:
+            return None
+        return path.join(current_app.config['UPLOADS_FOLDER'], self.storage_key)
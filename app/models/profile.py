@@ -0,0 +1,78 @@
+from typing import TYPE_CHECKING
+
+from ..extensions import db
+from .base import Base
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class DataProfile(Base):
+    __tablename__ = 'data_profiles'
+
+    # profiles describe the contents of a blob, so files sharing an upload share its profile too
+    storage_key = db.Column(db.String(255), nullable=False, unique=True)
+    row_count   = db.Column(db.Integer, nullable=False)
+
+    columns = db.relationship('ColumnProfile', back_populates='profile', cascade='all, delete-orphan',
+                              order_by='ColumnProfile.position')
+
+    @staticmethod
+    def record(storage_key: str, frame: 'DataFrame') -> 'DataProfile':
+        from ..services import profile_frame
+
+        profile = DataProfile.query.filter_by(storage_key=storage_key).first()
+        if profile:
+            return profile
+
+        summary = profile_frame(frame)
+        profile = DataProfile(storage_key=storage_key, row_count=summary['row_count']) # type: ignore
+        profile.columns = [
+            ColumnProfile(position=position, **column) # type: ignore
+            for position, column in enumerate(summary['columns'])
+        ]
+        db.session.add(profile)
+        return profile
+
+    @staticmethod
+    def remove(storage_key: str) -> None:
+        profile = DataProfile.query.filter_by(storage_key=storage_key).first()
+        if profile:
+            db.session.delete(profile)
+
+    @property
+    def names(self) -> list[str]:
+        return [column.name for column in self.columns]
+
+    @property
+    def kinds(self) -> dict[str, str]:
+        # the kind of each column, which plotters check the columns they're given against before anything is loaded
+        return {column.name: column.kind for column in self.columns}
+
+    @property
+    def cardinalities(self) -> dict[str, int]:
+        # the number of distinct values in each column, which limits how many cells a faceted chart would need
+        return {column.name: column.cardinality for column in self.columns}
+
+    def column(self, name: str) -> 'ColumnProfile | None':
+        return next((column for column in self.columns if column.name == name), None)
+
+
+class ColumnProfile(Base):
+    __tablename__ = 'column_profiles'
+
+    profile_id  = db.Column(db.Integer, db.ForeignKey('data_profiles.id'), nullable=False, index=True)
+    position    = db.Column(db.Integer, nullable=False)
+    name        = db.Column(db.String(255), nullable=False)
+    dtype       = db.Column(db.String(32), nullable=False)
+    kind        = db.Column(db.String(16), nullable=False) # one of 'numeric', 'categorical' or 'datetime'
+    null_count  = db.Column(db.Integer, nullable=False)
+    minimum     = db.Column(db.String(255), nullable=True)
+    maximum     = db.Column(db.String(255), nullable=True)
+    cardinality = db.Column(db.Integer, nullable=False)
+
+    profile = db.relationship('DataProfile', back_populates='columns')
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.kind == 'numeric'
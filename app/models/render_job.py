@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+
+from ..extensions import db
+from .base import Base
+
+class RenderJob(Base):
+    __tablename__ = 'render_jobs'
+
+    QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+    chart_id    = db.Column(db.Integer, db.ForeignKey('charts.id'), nullable=False, index=True)
+    status      = db.Column(db.String(16), default=QUEUED, nullable=False, index=True)
+    error       = db.Column(db.Text, nullable=True)
+    started_at  = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # jobs submitted together, like the charts redrawn after their file changes, share a batch
+    batch       = db.Column(db.String(32), nullable=True, index=True)
+
+    chart       = db.relationship('Chart', back_populates='render_jobs')
+
+    def finish(self, error: str | None = None) -> None:
+        self.status, self.error = (self.FAILED, error) if error else (self.DONE, None)
+        self.finished_at = datetime.now(timezone.utc)
+
@@ -1,13 +1,12 @@
 from functools import wraps
-from io import BytesIO
 import os
-import uuid
 import json
-import pandas as pd
 import base64
 
 from flask import (
     Blueprint,
+    Response,
+    abort,
     render_template,
     redirect,
     url_for,
@@ -18,17 +17,17 @@ from flask import (
 )
 from werkzeug.security import check_password_hash
 from werkzeug.utils import secure_filename
-from matplotlib.pyplot import close
-from requests import patch
 
+from app.caching import no_store
 from app.extensions import db
-from app.models import User, Chart, File, Notification
+from app.models import User, Chart, File, Notification, DataProfile
 from app.models.friend import Friend
 from app.models import User, Chart
 from app.models.friend import Friend
 from app.models.notification import Notification
 from app.forms import SignupForm, LoginForm, UploadForm, ChartForm, AddFriendForm
 from app.models.shared_data import SharedData
+from app.jobs import render_chart_image
 from app.models.associations import SharedChart
 from app.forms import (
     SignupForm,
@@ -40,10 +39,14 @@ from app.forms import (
 )
 from app.services import (
     Parser,
-    registry,
-    read_csv,
-    save_to_string,
-    save_figure_to_file,
+    ColumnError,
+    remove_image_files,
+    PlotJob,
+    RenderTimeout,
+    render_cache,
+    render_pool,
+    store_blob,
+    UploadError,
 )
 
 
@@ -53,12 +56,17 @@ bp = Blueprint('routes', __name__)
 # Utilities
 #
 
+# endpoints that set their own caching headers, which add_header leaves alone
+CACHEABLE_ENDPOINTS = {'routes.preview'}
+
+# the number of recent previews a session can fetch
+PREVIEW_TOKENS = 10
+
 @bp.after_request
 def add_header(response):
-    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '-1'
-    return response
+    if request.endpoint in CACHEABLE_ENDPOINTS:
+        return response
+    return no_store(response)
 
 def login_required(f):
     @wraps(f)
@@ -331,48 +339,54 @@ def generate_graph():
     chart_form  = ChartForm(prefix='ch', formdata=request.form)
     chart_src   = None
     show_config = False
-    data        = None
+    profile     = None
 
     # 1) CSV upload
     if upload_form.submit_upload.data and upload_form.validate_on_submit():
-        raw = upload_form.file.data.read()
         filename = secure_filename(upload_form.file.data.filename)
-        folder = current_app.config['UPLOADS_FOLDER']
-        os.makedirs(folder, exist_ok=True)
-        unique = f"{uuid.uuid4().hex}_{filename}"
-        path = os.path.join(folder, unique)
-        with open(path, 'wb') as f:
-            f.write(raw)
-        session['file_id'] = File(name=filename, owner_id=session['user_id'])
-        db.session.add(session['file_id'])
+        try:
+            key = store_blob(
+                upload_form.file.data.stream,
+                current_app.config['UPLOADS_FOLDER'],
+                max_bytes=current_app.config['MAX_UPLOAD_BYTES'],
+                chunk_size=current_app.config['UPLOAD_CHUNK_BYTES'],
+            )
+        except UploadError as e:
+            flash(str(e), "error")
+            return redirect(url_for('routes.generate_graph'))
+        file = File(name=filename, owner_id=session['user_id'], storage_key=key)
+        db.session.add(file)
         db.session.commit()
-        session['file_id'] = session['file_id'].id
+        session['file_id'] = file.id
+        # pandas is only imported once something actually reads a file, see services/plots/__init__.py
+        from app.services import ensure_profile
+        ensure_profile(file)
         session['uploaded_filename'] = filename
         return redirect(url_for('routes.generate_graph'))
 
-    # 2) Load DataFrame & populate choices
+    # 2) Look up the file's column profile & populate choices
     if 'file_id' in session:
         file = File.query.get(session['file_id'])
         if file:
-            folder = current_app.config['UPLOADS_FOLDER']
-            suffix = f"_{file.name}"
-            candidates = [fn for fn in os.listdir(folder) if fn.endswith(suffix)]
-            if candidates:
-                data = pd.read_csv(os.path.join(folder, candidates[0]))
-                cols = list(data.columns)
+            # files uploaded before profiles existed are profiled the first time they're opened here
+            from app.services import ensure_profile
+            if file.storage_path and os.path.exists(file.storage_path) and (profile := ensure_profile(file)):
+                cols = profile.names
                 chart_form.x_col.choices = [('', '– Select X –')] + [(c, c) for c in cols]
                 chart_form.y_col.choices = [('', '– Select Y –')] + [(c, c) for c in cols]
                 chart_form.column.choices = [('', '– Select column –')] + [(c, c) for c in cols]
+                chart_form.facet_by.choices = [('', '– None –')] + [(c, c) for c in cols]
+                chart_form.group_by.choices = [('', '– None –')] + [(c, c) for c in cols]
                 show_config = True
             else:
                 flash("Uploaded file missing; please re-upload.", "error")
                 session.clear()
 
     # 3) Preview only—do NOT commit anything
-    if data is not None and chart_form.submit_generate.data and chart_form.validate_on_submit():
-        spec = {'source': data}
+    if profile is not None and chart_form.submit_generate.data and chart_form.validate_on_submit():
+        spec = {}
         # copy optional fields
-        for fld in ['title','x_label','y_label','color','grid']:
+        for fld in ['title','x_label','y_label','color','grid','facet_by','group_by','agg','resample']:
             v = getattr(chart_form, fld).data
             if v:
                 spec[fld] = v
@@ -401,32 +415,43 @@ def generate_graph():
                 return redirect(url_for('routes.generate_graph'))
             spec['column'] = col
 
-        # bind & validate types
-        bind_spec = spec.copy(); bind_spec.pop('graph_type',None)
+        # check the columns against the kinds the plotter declares, using the stored profile, before loading any data
+        from app.services import registry
         try:
-            bound,_ = registry.functions[t].bind_args(**bind_spec)
-            if t=='scatter' and not pd.api.types.is_numeric_dtype(data[bound['x_col']]):
-                flash("X must be numeric for scatter.", "error")
-                return redirect(url_for('routes.generate_graph'))
-            if t in ['line','scatter','bar','area','box'] and not pd.api.types.is_numeric_dtype(data[bound['y_col']]):
-                flash("Y must be numeric for this chart.", "error")
-                return redirect(url_for('routes.generate_graph'))
-            fig = registry.functions[t].function(**bound)
+            registry.functions[t].check_columns(spec, profile.kinds, profile.cardinalities)
+        except ColumnError as e:
+            for problem in e.problems:
+                flash(problem, "error")
+            return redirect(url_for('routes.generate_graph'))
+
+        # load only the columns the chart uses, then bind & render in the worker pool
+        job = PlotJob(t, spec, file.storage_key, file.storage_path,
+                      chunked_above=current_app.config['CHUNKED_RENDER_BYTES'])
+        try:
+            image = render_pool.render(job)
         except KeyError as e:
             flash(f"Column '{e.args[0]}' not found.", "error")
             return redirect(url_for('routes.generate_graph'))
+        except RenderTimeout as e:
+            flash(str(e), "error")
+            return redirect(url_for('routes.generate_graph'))
         except Exception as e:
             current_app.logger.error(f"Chart gen error: {e}")
             flash("Error generating chart. Check inputs.", "error")
             return redirect(url_for('routes.generate_graph'))
 
-        # render preview as base64
-        buf = BytesIO(); fig.savefig(buf, format='png'); buf.seek(0)
-        chart_src = 'data:image/png;base64,' + base64.b64encode(buf.read()).decode()
-        close(fig)
+        # previews are served from the render cache by their key, falling back to inlining them where they
+        # couldn't be cached
+        token = render_cache.key_for(job)
+        if token and token in render_cache:
+            tokens = [token] + [old for old in session.get('preview_tokens', []) if old != token]
+            session['preview_tokens'] = tokens[:PREVIEW_TOKENS]
+            chart_src = url_for('routes.preview', token=token)
+        else:
+            chart_src = 'data:image/png;base64,' + base64.b64encode(image).decode()
 
         # stash minimal info for save_chart
-        session['pending_spec'] = {k:v for k,v in spec.items() if k!='source'}
+        session['pending_spec'] = spec
         session['pending_file_id'] = session['file_id']
         session['pending_title'] = spec.get('title') or 'Untitled'
 
@@ -442,6 +467,24 @@ def generate_graph():
     )
 
 
+@bp.route('/preview/<token>.png')
+@login_required
+def preview(token):
+    # previews can only be fetched by the session that made them
+    if token not in session.get('preview_tokens', []):
+        abort(404)
+    image = render_cache.get(token)
+    if image is None:
+        abort(404)
+
+    # the token is a hash of everything that went into the image, so it makes a strong etag
+    response = Response(image, mimetype='image/png')
+    response.set_etag(token)
+    response.cache_control.private = True
+    response.cache_control.max_age = current_app.config['PREVIEW_MAX_AGE']
+    return response.make_conditional(request)
+
+
 @bp.route('/save-chart', methods=['POST'])
 @login_required
 def save_chart():
@@ -466,24 +509,8 @@ def save_chart():
     db.session.add(chart)
     db.session.commit()
 
-    # 2) Reload the CSV
-    folder = current_app.config['UPLOADS_FOLDER']
-    file = File.query.get(pending['file_id'])
-    suffix = f"_{file.name}"
-    fn = next(fn for fn in os.listdir(folder) if fn.endswith(suffix))
-    data = pd.read_csv(os.path.join(folder, fn))
-
-    # 3) Prepare args for the plot function
-    spec_for_plot = spec_for_db.copy()
-    graph_type    = spec_for_plot.pop('graph_type')   # <-- remove this!
-    spec_for_plot['source'] = data
-
-    # 4) Regenerate and save the figure
-    fig = registry.functions[graph_type].function(**spec_for_plot)
-    path = save_figure_to_file(fig, chart.id)
-    chart.image_path = path
-    db.session.commit()
-    close(fig)
+    # 2) Regenerate and save the figure from the columns it uses
+    render_chart_image(chart)
 
     flash("Chart saved to dashboard!", "success")
     return redirect(url_for('routes.dashboard'))
@@ -550,34 +577,28 @@ def delete_chart(chart_id):
     else:
         # full delete of an original chart: image file, record, and file if unused
         file = chart.file
-        file_name = file.name
-        uploads_folder = current_app.config['UPLOADS_FOLDER']
-        pattern = f"_{file_name}"
 
-        # delete the chart’s image from disk
+        # delete the chart’s images from disk
         if chart.image_path:
-            image_path = os.path.join(
-                current_app.root_path,
-                'static', 'chart_images',
-                os.path.basename(chart.image_path)
-            )
-            if os.path.exists(image_path):
-                os.remove(image_path)
+            remove_image_files(chart.image_path)
 
         # remove the Chart record
         db.session.delete(chart)
         db.session.commit()
 
-        # delete the File record + any on-disk CSV if it’s no longer used
+        # delete the File record + the on-disk CSV if no other file shares it
         if not file.charts:
-            for fname in os.listdir(uploads_folder):
-                if fname.endswith(pattern):
-                    try:
-                        os.remove(os.path.join(uploads_folder, fname))
-                    except Exception as e:
-                        current_app.logger.warning(f"Failed to delete file {fname}: {e}")
+            key, blob_path = file.storage_key, file.storage_path
             db.session.delete(file)
             db.session.commit()
+            if key and not File.reference_count(key):
+                DataProfile.remove(key)
+                db.session.commit()
+                try:
+                    from app.services import discard
+                    discard(key, blob_path)
+                except Exception as e:
+                    current_app.logger.warning(f"Failed to delete file {key}: {e}")
 
         flash("Chart and associated file (if unused) deleted successfully.", "success")
 
@@ -1,2 +1,15 @@
+from .lazy import lazy_exports
 from .specifier import Parser, ParseError, Tokenizer, Token
-from .plots import BindError, registry, read_csv, save_to_string, save_figure_to_file
+from .plots import (
+    BindError, ColumnError, read_csv, save_to_string, save_figure_to_file, save_image_to_file, remove_image_files,
+    PlotJob, RenderTimeout, render_cache, render_pool,
+)
+from .data import UploadError, UploadTooLarge, frame_cache, store_blob, blob_digest
+
+# these need pandas or matplotlib, so are looked up lazily. see plots/__init__.py
+_exports = {
+    '.plots': ['registry', 'render_figure'],
+    '.data': ['load_frame', 'load_columns', 'ingest', 'discard', 'profile_frame'],
+    '.profiles': ['ensure_profile'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,11 @@
+from ..lazy import lazy_exports
+from .blobs import UploadError, UploadTooLarge, blob_digest, store_blob, remove_blob
+from .cache import FrameCache, frame_cache
+
+# everything else needs pandas, so is only imported the first time it's asked for. see plots/__init__.py
+_exports = {
+    '.columnar': ['read_columns', 'write_columns', 'remove_columns'],
+    '.loader': ['file_version', 'load_frame', 'load_columns', 'iter_chunks', 'ingest', 'discard'],
+    '.profile': ['column_kind', 'profile_frame'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
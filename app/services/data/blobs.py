@@ -0,0 +1,97 @@
+from codecs import getincrementaldecoder
+from hashlib import sha256
+from os import makedirs, path, remove, replace
+from re import fullmatch
+from tempfile import mkstemp
+from typing import BinaryIO
+
+
+CHUNK_SIZE = 64 * 1024
+HEADER_LIMIT = 64 * 1024 # how much of the upload we look through for the end of the header row
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadTooLarge(UploadError):
+
+    def __init__(self, limit: int) -> None:
+        size = f"{limit // (1024 * 1024)} MB" if limit >= 1024 * 1024 else f"{limit} bytes"
+        super().__init__(f"Uploads can be at most {size}.")
+
+
+def blob_key(digest: str) -> str:
+    return f"{digest}.csv"
+
+
+def blob_digest(key: str | None) -> str | None:
+    # the content hash a key was made from, or None for uploads stored before blobs were content addressed
+    if key and fullmatch(r'[0-9a-f]{64}\.csv', key):
+        return key[:-len('.csv')]
+    return None
+
+
+def store_blob(stream: BinaryIO, folder: str, max_bytes: int | None = None, chunk_size: int = CHUNK_SIZE) -> str:
+    # streams an upload into the folder a chunk at a time under the hash of its contents, returning its storage key.
+    # identical uploads end up sharing the one blob
+    makedirs(folder, exist_ok=True)
+    handle, temp_path = mkstemp(dir=folder, suffix='.part')
+
+    digest, size, header = sha256(), 0, b''
+    try:
+        with open(handle, 'wb') as temp:
+            while chunk := stream.read(chunk_size):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+
+                # the header is checked as soon as we've seen all of it, so bad uploads stop early
+                if header is not None:
+                    header += chunk
+                    if b'\n' in header or len(header) >= HEADER_LIMIT:
+                        check_header(header)
+                        header = None
+
+                digest.update(chunk)
+                temp.write(chunk)
+
+        if header is not None:
+            check_header(header)
+
+    except BaseException:
+        remove(temp_path)
+        raise
+
+    key = blob_key(digest.hexdigest())
+    blob_path = path.join(folder, key)
+
+    if path.exists(blob_path):
+        # leaving the existing blob alone keeps its columnar copy and cache entries valid
+        remove(temp_path)
+    else:
+        replace(temp_path, blob_path)
+
+    return key
+
+
+def check_header(start: bytes) -> None:
+    line = start[:HEADER_LIMIT].split(b'\n', 1)[0].rstrip(b'\r')
+
+    if b'\0' in line:
+        raise UploadError("Uploads must be CSV text.")
+
+    try:
+        # the line may have been cut off part way through a character, which isn't an error yet
+        text = getincrementaldecoder('utf-8-sig')().decode(line, final=False)
+    except UnicodeDecodeError:
+        raise UploadError("Uploads must be UTF-8 encoded CSV.")
+
+    if not text.replace(',', '').strip():
+        raise UploadError("Uploads must start with a header row.")
+
+
+def remove_blob(folder: str, key: str) -> None:
+    blob_path = path.join(folder, key)
+    if path.exists(blob_path):
+        remove(blob_path)
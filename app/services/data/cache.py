@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Hashable
+
+from flask import Flask
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class FrameCache:
+    budget: int # the total number of bytes the cached frames are allowed to take up
+    size: int   # the number of bytes currently taken up by cached frames
+
+    def __init__(self, budget: int = 256 * 1024 * 1024) -> None:
+        self.budget, self.size = budget, 0
+        # maps key -> (version, frame, size), ordered from least to most recently used
+        self._frames: OrderedDict[Hashable, tuple[Hashable, 'DataFrame', int]] = OrderedDict()
+        self._lock = Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.budget = app.config.get('DATAFRAME_CACHE_BYTES', self.budget)
+        self.clear()
+
+    def get(self, key: Hashable, version: Hashable, load: Callable[[], 'DataFrame']) -> 'DataFrame':
+        frame = self.lookup(key, version)
+        if frame is not None:
+            return frame
+
+        # loading happens outside the lock so that a slow parse doesn't block every other request
+        frame = load()
+        self.put(key, version, frame)
+        return frame
+
+    def lookup(self, key: Hashable, version: Hashable) -> 'DataFrame | None':
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry and entry[0] == version:
+                self._frames.move_to_end(key)
+                return entry[1]
+        return None
+
+    def put(self, key: Hashable, version: Hashable, frame: 'DataFrame') -> None:
+        size = int(frame.memory_usage(deep=True).sum())
+
+        with self._lock:
+            self._discard(key)
+            # frames that could never fit are left uncached
+            if size <= self.budget:
+                self._frames[key] = (version, frame, size)
+                self.size += size
+                self._evict()
+
+    def invalidate(self, key: Hashable) -> None:
+        # tuple keys are grouped under their first element, so invalidating a blob drops all of its columns too
+        with self._lock:
+            for cached in [cached for cached in self._frames if cached == key or _group(cached) == key]:
+                self._discard(cached)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self.size = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._frames.pop(key, None)
+        if entry:
+            self.size -= entry[2]
+
+    def _evict(self) -> None:
+        while self.size > self.budget and self._frames:
+            _, (_, _, size) = self._frames.popitem(last=False)
+            self.size -= size
+
+
+frame_cache = FrameCache()
+
+
+def _group(key: Hashable) -> Hashable:
+    return key[0] if isinstance(key, tuple) and key else None
@@ -0,0 +1,128 @@
+import json
+from os import makedirs, path
+from shutil import rmtree
+from typing import Iterator
+
+import numpy as np
+from pandas import DataFrame
+from pandas.api.types import infer_dtype
+
+
+# column kinds that can be stored as a single typed array and mapped straight back in. datetimes are always naive,
+# see plots/helpers.py
+ARRAY_KINDS = set('biufM')
+MANIFEST = 'manifest.json'
+
+
+def columns_path(csv_path: str) -> str:
+    return f"{csv_path}.cols"
+
+
+def write_columns(frame: DataFrame, csv_path: str, version) -> bool:
+    # writes a typed copy of the frame next to its csv, returning False if some column can't be stored
+    entries = []
+    arrays: list[tuple[str, np.ndarray]] = []
+
+    for position, (name, series) in enumerate(frame.items()):
+        if series.dtype.kind in ARRAY_KINDS:
+            entries.append({'name': name, 'kind': 'array'})
+            arrays.append((f"{position}.npy", series.to_numpy()))
+        elif series.dtype == object and infer_dtype(series, skipna=True) in ('string', 'empty'):
+            # strings are stored as integer codes into a table of unique values, both of which can be mapped
+            codes, uniques = series.factorize()
+            entries.append({'name': name, 'kind': 'strings'})
+            arrays.append((f"{position}.codes.npy", codes.astype(np.int32)))
+            arrays.append((f"{position}.values.npy", np.asarray(uniques, dtype=str)))
+        else:
+            return False
+
+    folder = columns_path(csv_path)
+    remove_columns(csv_path)
+    makedirs(folder)
+
+    for name, array in arrays:
+        np.save(path.join(folder, name), array, allow_pickle=False)
+
+    # the manifest is written last so a half written folder is never mistaken for a complete one
+    with open(path.join(folder, MANIFEST), 'w') as manifest:
+        json.dump({'version': list(version), 'rows': len(frame), 'columns': entries}, manifest)
+
+    return True
+
+
+def _map_columns(csv_path: str, version, columns: list[str] | None) -> tuple[int, dict[str, tuple]] | None:
+    # maps each column's arrays without decoding anything, giving back the row count and name -> (kind, arrays)
+    folder = columns_path(csv_path)
+    try:
+        with open(path.join(folder, MANIFEST)) as manifest:
+            info = json.load(manifest)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if info['version'] != list(version):
+        return None
+
+    positions = {entry['name']: position for position, entry in enumerate(info['columns'])}
+    for name in columns or []:
+        if name not in positions:
+            raise KeyError(name)
+
+    mapped = {}
+    for name in (columns if columns is not None else positions):
+        position = positions[name]
+        if info['columns'][position]['kind'] == 'array':
+            mapped[name] = ('array', np.load(path.join(folder, f"{position}.npy"), mmap_mode='r'))
+        else:
+            codes = np.load(path.join(folder, f"{position}.codes.npy"), mmap_mode='r')
+            values = np.load(path.join(folder, f"{position}.values.npy"), mmap_mode='r')
+            mapped[name] = ('strings', codes, values)
+
+    return info['rows'], mapped
+
+
+def _frame(mapped: dict[str, tuple], rows: slice, index) -> DataFrame:
+    loaded = {
+        name: arrays[0][rows] if kind == 'array' else _decode_strings(arrays[0][rows], arrays[1])
+        for name, (kind, *arrays) in mapped.items()
+    }
+    # copy=False keeps the mapped arrays as the frame's backing memory rather than reading them in
+    return DataFrame(loaded, index=index, copy=False)
+
+
+def read_columns(csv_path: str, version, columns: list[str] | None = None) -> DataFrame | None:
+    # maps the typed copy (or just some of its columns) back in, or returns None if there isn't an up to date one
+    if (found := _map_columns(csv_path, version, columns)) is None:
+        return None
+    rows, mapped = found
+    return _frame(mapped, slice(None), range(rows))
+
+
+def read_column_chunks(csv_path: str, version, columns: list[str], rows: int) -> Iterator[DataFrame] | None:
+    # like read_columns, but a bounded number of rows at a time. strings are only decoded a chunk at a time too
+    if (found := _map_columns(csv_path, version, columns)) is None:
+        return None
+    total, mapped = found
+
+    def chunks() -> Iterator[DataFrame]:
+        for start in range(0, total, rows):
+            stop = min(start + rows, total)
+            yield _frame(mapped, slice(start, stop), range(start, stop))
+
+    return chunks()
+
+
+def remove_columns(csv_path: str) -> None:
+    rmtree(columns_path(csv_path), ignore_errors=True)
+
+
+def _decode_strings(codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    if not len(values):
+        return np.full(len(codes), np.nan, dtype=object)
+
+    # whichever of the codes and the table of values is smaller is the one converted to python strings
+    if len(codes) < len(values):
+        decoded = values[codes].astype(object)
+    else:
+        decoded = values.astype(object)[codes]
+    decoded[codes < 0] = np.nan
+    return decoded
@@ -0,0 +1,81 @@
+from os import path, stat
+from typing import Iterator
+
+from pandas import DataFrame
+
+from ..plots.helpers import read_csv
+from .blobs import remove_blob
+from .cache import frame_cache
+from .columnar import read_column_chunks, read_columns, remove_columns, write_columns
+
+
+CHUNK_ROWS = 250_000
+
+
+def file_version(blob_path: str) -> tuple[int, int]:
+    # the modification time and size change whenever the contents of an upload are replaced
+    info = stat(blob_path)
+    return info.st_mtime_ns, info.st_size
+
+
+def _read(blob_path: str, version: tuple[int, int], columns: list[str] | None = None) -> DataFrame:
+    frame = read_columns(blob_path, version, columns)
+    return frame if frame is not None else read_csv(blob_path, usecols=columns)
+
+
+def _column(frame: DataFrame, column: str) -> DataFrame:
+    # copy=False so that columns mapped from the columnar copy stay mapped rather than being read in
+    return DataFrame({column: frame[column]}, copy=False)
+
+
+def load_frame(key: str, blob_path: str) -> DataFrame:
+    # frames are cached by storage key, so every file sharing a blob shares the parsed copy too
+    version = file_version(blob_path)
+    return frame_cache.get(key, version, lambda: _read(blob_path, version))
+
+
+def load_columns(key: str, blob_path: str, columns: list[str]) -> DataFrame:
+    # loads only the given columns, reusing any that are already cached. columns are cached individually so
+    # that charts drawing different columns of the same upload still share what they have in common
+    version = file_version(blob_path)
+    parts = {column: frame_cache.lookup((key, column), version) for column in columns}
+
+    if missing := [column for column, part in parts.items() if part is None]:
+        frame = _read(blob_path, version, missing)
+        for column in missing:
+            parts[column] = _column(frame, column)
+            frame_cache.put((key, column), version, parts[column])
+
+    return DataFrame({column: parts[column][column] for column in columns}, copy=False)
+
+
+def iter_chunks(blob_path: str, columns: list[str], rows: int = CHUNK_ROWS) -> Iterator[DataFrame]:
+    # yields the given columns a bounded number of rows at a time, without ever holding the whole file in memory
+    chunks = read_column_chunks(blob_path, file_version(blob_path), columns, rows)
+    if chunks is None:
+        chunks = read_csv(blob_path, usecols=columns, chunksize=rows)
+    yield from chunks
+
+
+def ingest(key: str, blob_path: str) -> DataFrame | None:
+    # parses a freshly written upload once, leaving a typed copy on disk and the frame in the cache
+    version = file_version(blob_path)
+    if (frame := read_columns(blob_path, version)) is not None:
+        return frame
+
+    try:
+        frame = read_csv(blob_path)
+    except ValueError:
+        # unreadable uploads are still kept, they just fail later in the same way they always have
+        return None
+    write_columns(frame, blob_path, version)
+    for column in frame.columns:
+        frame_cache.put((key, column), version, _column(frame, column))
+    return frame
+
+
+def discard(key: str, blob_path: str) -> None:
+    # removes a blob along with everything derived from it, once nothing refers to it anymore
+    frame_cache.invalidate(key)
+    remove_columns(blob_path)
+    remove_blob(path.dirname(blob_path), key)
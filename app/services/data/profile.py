@@ -0,0 +1,42 @@
+from typing import Any
+
+from pandas import DataFrame, Series
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+
+def column_kind(series: Series) -> str:
+    if is_datetime64_any_dtype(series):
+        return 'datetime'
+    if is_numeric_dtype(series):
+        return 'numeric'
+    return 'categorical'
+
+
+def profile_frame(frame: DataFrame) -> dict[str, Any]:
+    return {
+        'row_count': len(frame),
+        'columns': [profile_column(str(name), series) for name, series in frame.items()],
+    }
+
+
+def profile_column(name: str, series: Series) -> dict[str, Any]:
+    present = series.dropna()
+    kind = column_kind(series)
+
+    minimum = maximum = None
+    if len(present) and kind != 'categorical':
+        minimum, maximum = present.min(), present.max()
+    elif len(present):
+        # categorical columns can mix types, so their range is taken over the values as strings
+        as_strings = present.astype(str)
+        minimum, maximum = as_strings.min(), as_strings.max()
+
+    return {
+        'name': name,
+        'dtype': str(series.dtype),
+        'kind': kind,
+        'null_count': int(series.isna().sum()),
+        'minimum': None if minimum is None else str(minimum),
+        'maximum': None if maximum is None else str(maximum),
+        'cardinality': int(present.nunique()),
+    }
@@ -1,3 +1,20 @@
-from .helpers import read_csv, save_to_string, save_figure_to_file
-from .registry import BindError
-from .plotters import registry
+from ..lazy import lazy_exports
+from .helpers import read_csv, save_to_string, save_figure_to_file, save_image_to_file, remove_image_files
+from .registry import BindError, ColumnError
+from .job import PlotJob
+from .images import image_name, image_width, remove_renditions, save_renditions
+from .render_cache import RenderCache, render_cache
+from .pool import RenderPool, RenderTimeout, render_pool
+
+# importing registry.py bound the module to this name, but the name belongs to the plot registry below
+del registry
+
+# the plotters need matplotlib and pandas, which take a while to import, so these are only imported the first
+# time they're asked for. that way the pages and commands that never draw a chart don't pay for them
+_exports = {
+    '.plotters': ['registry'],
+    '.context': ['MarginLayout', 'new_figure', 'warm_up'],
+    '.render': ['render_figure', 'render_image'],
+    '.series': ['pack_series', 'series_for_spec', 'series_to_json'],
+}
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,119 @@
+from functools import wraps
+from inspect import Parameter, signature
+from json import dumps
+from typing import Any, Callable, Literal, Optional
+
+from matplotlib.figure import Figure
+from pandas import DataFrame
+
+from ..data import file_version, frame_cache, load_columns
+from .registry import ColumnName
+
+Aggregate = Literal['sum', 'mean', 'count', 'min', 'max']
+Period = Literal['hour', 'day', 'week', 'month', 'quarter', 'year']
+
+PERIODS = {'hour': 'h', 'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+EMPTY = {'sum': 0, 'count': 0} # the value an aggregate takes over no rows, where it has one
+STAGE = ('group_by', 'agg', 'resample')
+
+
+def aggregated(function: Callable[..., Figure]) -> Callable[..., Figure]:
+    # adds group_by, agg and resample parameters to a plotter of x against y columns. given any of them, the rows
+    # sharing an x are combined into one before they're drawn. the plotter must take its source first
+    sig = signature(function)
+    source = next(iter(sig.parameters))
+
+    @wraps(function)
+    def draw(*args, group_by: Optional[str] = None, agg: Optional[str] = None, resample: Optional[str] = None,
+             **kwargs) -> Figure:
+        arguments = sig.bind(*args, **kwargs).arguments
+        if group_by or agg or resample:
+            stage = _stage({**arguments, 'group_by': group_by, 'agg': agg, 'resample': resample})
+            arguments = _with(arguments, source, aggregate_frame(arguments[source], **stage), stage)
+        return function(**arguments)
+
+    added = [
+        Parameter('group_by', Parameter.KEYWORD_ONLY, default=None, annotation=Optional[ColumnName]),
+        Parameter('agg', Parameter.KEYWORD_ONLY, default=None, annotation=Optional[Aggregate]),
+        Parameter('resample', Parameter.KEYWORD_ONLY, default=None, annotation=Optional[Period]),
+    ]
+    draw.__signature__ = sig.replace(parameters=[*sig.parameters.values(), *added])
+    # the registry runs these with the rest of its column checks, so specs that can't be aggregated are turned away
+    # before anything is saved or loaded
+    draw.column_checks = [*getattr(function, 'column_checks', []), check_stage]
+    return draw
+
+
+def check_stage(
+    args: dict[str, Any], kinds: dict[str, str], cardinalities: dict[str, int] | None = None
+) -> list[str]:
+    # the problems aggregate_frame would raise, found from the kinds of the file's columns alone
+    problems = []
+    x_col, group_by = args.get('x_col'), args.get('group_by')
+    if args.get('resample') and (kind := kinds.get(str(x_col))) not in (None, 'datetime'):
+        problems.append(f"resample needs a datetime x_col, but '{x_col}' is {kind}.")
+    if group_by and group_by in (x_col, args.get('facet_by')):
+        problems.append(f"Can't group by '{group_by}', since the chart is already split by it.")
+    return problems
+
+
+def aggregate_frame(
+    frame: DataFrame, x_col: str, y_col: list[str], agg: str = 'sum',
+    group_by: str | None = None, resample: str | None = None, keep: tuple[str, ...] = ()
+) -> DataFrame:
+    # combines the y values of every row sharing an x, and the same values of the kept columns, with one vectorized
+    # groupby. resampling first rounds datetime x down to the start of its period. given group_by, each of its values
+    # becomes a series of its own, named after it
+    if group_by and group_by in (x_col, *keep):
+        raise ValueError(f"Can't group by {group_by!r}, since the chart is already split by it.")
+    if x_col in keep:
+        raise ValueError(f"Can't facet by {x_col!r}, since it's the x axis.")
+    x = frame[x_col]
+    if resample:
+        if x.dtype.kind != 'M':
+            raise ValueError(f"Can't resample by {resample}, since {x_col!r} isn't a datetime column.")
+        x = x.dt.to_period(PERIODS[resample]).dt.start_time
+
+    keys = [frame[column] for column in keep] + ([frame[group_by]] if group_by else []) + [x.rename(x_col)]
+    combined = frame[y_col].groupby(keys, sort=True).agg(agg)
+
+    if group_by:
+        combined = combined.unstack(group_by, fill_value=EMPTY.get(agg))
+        combined.columns = [
+            f"{group_by} = {value}" if len(y_col) == 1 else f"{column} ({group_by} = {value})"
+            for column, value in combined.columns
+        ]
+    return combined.reset_index()
+
+
+def load_aggregated(key: str, blob_path: str, arguments: dict[str, Any], columns: list[str]) -> dict[str, Any]:
+    # gives the bound arguments their source, loading the given columns. arguments that aggregate are given the
+    # aggregated frame instead, which is cached by file version so redrawing with other options skips the raw rows
+    if not any(arguments.get(name) for name in STAGE):
+        return {**arguments, 'source': load_columns(key, blob_path, columns)}
+
+    stage = _stage(arguments)
+    # faceted plots keep their facet column, so that the aggregated frame can still be split
+    if facet_by := arguments.get('facet_by'):
+        stage['keep'] = (facet_by,)
+    frame = frame_cache.get(
+        (key, 'aggregate', dumps(stage, sort_keys=True)), file_version(blob_path),
+        lambda: aggregate_frame(load_columns(key, blob_path, columns), **stage)
+    )
+    return _with(arguments, 'source', frame, stage)
+
+
+def _stage(arguments: dict[str, Any]) -> dict[str, Any]:
+    y_col = arguments['y_col']
+    return {
+        'x_col': arguments['x_col'], 'y_col': [y_col] if isinstance(y_col, str) else list(y_col),
+        'agg': arguments.get('agg') or 'sum', 'group_by': arguments.get('group_by'),
+        'resample': arguments.get('resample'),
+    }
+
+
+def _with(arguments: dict[str, Any], source: str, frame: DataFrame, stage: dict[str, Any]) -> dict[str, Any]:
+    # the arguments drawing the aggregated frame, which has already been through the stage
+    y_col = [column for column in frame.columns if column not in (*stage.get('keep', ()), stage['x_col'])]
+    cleared = {name: None for name in STAGE if name in arguments}
+    return {**arguments, **cleared, source: frame, 'y_col': y_col}
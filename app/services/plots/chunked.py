@@ -0,0 +1,45 @@
+from typing import Callable, Iterator
+
+import numpy as np
+from pandas import DataFrame, Index, Series
+from pandas.api.types import is_numeric_dtype
+
+
+Chunks = Callable[[], Iterator[DataFrame]]
+
+
+def histogram_counts(chunks: Chunks, column: str, bins: int) -> tuple[np.ndarray, np.ndarray] | None:
+    # gives the same counts and edges as one np.histogram over the whole column, in two passes over the chunks.
+    # returns None for non numeric columns, which can't be binned this way
+    low, high = np.inf, -np.inf
+    for chunk in chunks():
+        values = chunk[column]
+        if not is_numeric_dtype(values):
+            return None
+        if values.notna().any():
+            low, high = min(low, values.min()), max(high, values.max())
+
+    if low > high:
+        # an empty column is binned the same way numpy bins an empty array
+        low, high = 0, 1
+
+    counts, edges = np.zeros(bins, dtype=np.int64), None
+    for chunk in chunks():
+        partial, edges = np.histogram(chunk[column].dropna(), bins=bins, range=(low, high))
+        counts += partial
+
+    if edges is None:
+        edges = np.histogram_bin_edges([], bins=bins, range=(low, high))
+
+    return counts, edges
+
+
+def value_counts(chunks: Chunks, column: str) -> Series:
+    # merges the value counts of every chunk, largest first like Series.value_counts
+    total, seen = Series(dtype=np.int64), Index([])
+    for chunk in chunks():
+        partial = chunk[column].value_counts(sort=False)
+        total = total.add(partial, fill_value=0)
+        # ties are broken by first appearance, so we remember the order values were first seen in
+        seen = seen.append(partial.index.difference(seen, sort=False))
+    return total.reindex(seen).astype(np.int64).sort_values(ascending=False, kind='stable')
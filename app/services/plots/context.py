@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Iterator
+
+from matplotlib import font_manager, rcParams
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.layout_engine import LayoutEngine
+
+
+_warmed, _lock = False, Lock()
+# the figure and axes plotters draw into while the cells of a facet grid are being drawn
+_cell: ContextVar[tuple[Figure, Axes] | None] = ContextVar('cell', default=None)
+
+
+class MarginLayout(LayoutEngine):
+    # places the axes inside margins sized from the fonts in use, rather than measuring every piece of text the way
+    # bbox_inches='tight' or tight_layout do. that makes laying out a figure a bit of arithmetic instead of an extra
+    # pass over everything in it
+    _adjust_compatible = True
+    _colorbar_gridspec = True
+
+    def execute(self, fig: Figure) -> None:
+        width, height = fig.get_size_inches()
+        left, right, top, bottom = _margins()
+        # a title over a whole grid of axes needs a line of its own
+        outer_top = top + (_points('figure.titlesize') * 1.4 / 72 if fig.get_suptitle() else 0)
+        left, right = min(left / width, 0.4), min(right / width, 0.4)
+        top, bottom = min(outer_top / height, 0.4), min(bottom / height, 0.4)
+        fig.subplots_adjust(left=left, right=1 - right, top=1 - top, bottom=bottom)
+
+        # and each of its cells needs the same room around it as a single axes would have
+        rows, columns = fig.axes[0].get_subplotspec().get_geometry()[:2] if fig.axes else (1, 1)
+        if rows > 1 or columns > 1:
+            margins = _margins()
+            fig.subplots_adjust(
+                wspace=_spacing(width * (1 - left - right), columns, margins[0] + margins[1]),
+                hspace=_spacing(height * (1 - top - bottom), rows, margins[2] + margins[3]),
+            )
+
+
+def new_figure(figsize: tuple[float, float]) -> Figure:
+    return Figure(figsize=figsize, layout=MarginLayout())
+
+
+def new_axes(figsize: tuple[float, float]) -> tuple[Figure, Axes]:
+    # a figure with a single axes for a plotter to draw on, or the cell it's drawing while a facet grid is drawn
+    if (cell := _cell.get()) is not None:
+        return cell
+    fig = new_figure(figsize)
+    return fig, fig.add_subplot(1, 1, 1)
+
+
+@contextmanager
+def drawing_into(fig: Figure, ax: Axes) -> Iterator[None]:
+    token = _cell.set((fig, ax))
+    try:
+        yield
+    finally:
+        _cell.reset(token)
+
+
+def warm_up() -> None:
+    # loads the font cache and draws a small figure, so that the first real render in a process doesn't pay for it
+    global _warmed
+    with _lock:
+        if _warmed:
+            return
+        _warmed = True
+
+    # agg can refuse to draw paths with millions of vertices in one go, so they are drawn in chunks
+    rcParams['agg.path.chunksize'] = 20_000
+    font_manager.findfont(font_manager.FontProperties())
+
+    fig = new_figure((2, 2))
+    ax  = fig.add_subplot(1, 1, 1)
+    ax.plot([0, 1], [0, 1])
+    ax.set(title='Title', xlabel='x', ylabel='y')
+    FigureCanvasAgg(fig).draw()
+
+
+def _margins() -> tuple[float, float, float, float]:
+    # left, right, top and bottom margins in inches: room for tick labels of a few characters, axis labels and a title
+    tick  = _points('ytick.labelsize')
+    label = _points('axes.labelsize')
+    title = _points('axes.titlesize')
+    return (tick * 4 + label * 1.2 + 16) / 72, (tick * 2 + 4) / 72, (title * 1.2 + 12) / 72, (tick + label * 1.2 + 16) / 72
+
+
+def _spacing(extent: float, cells: int, gap: float) -> float | None:
+    # the space between cells as a fraction of a cell's size, which is how subplots_adjust wants it
+    if cells < 2:
+        return None
+    size = (extent - gap * (cells - 1)) / cells
+    return gap / size if size > 0 else 1.0
+
+
+def _points(param: str) -> float:
+    return font_manager.FontProperties(size=rcParams[param]).get_size_in_points()
@@ -0,0 +1,88 @@
+import numpy as np
+from matplotlib import rcParams
+from pandas import DataFrame, Series
+from pandas.api.types import is_numeric_dtype
+
+
+# plots with fewer points than this per pixel of width are drawn as they are
+POINTS_PER_PIXEL = 4
+
+
+def pixel_size(figsize: tuple[float, float], dpi: float | None = None) -> tuple[int, int]:
+    dpi = dpi or rcParams['figure.dpi']
+    return max(int(figsize[0] * dpi), 1), max(int(figsize[1] * dpi), 1)
+
+
+def minmax_indices(values: np.ndarray, buckets: int) -> np.ndarray:
+    # splits the values into consecutive buckets and keeps the first, last, smallest and largest of each. drawn as a
+    # line, that covers exactly the same pixels as every point in the bucket would
+    count = len(values)
+    size = -(-count // buckets)
+    buckets = -(-count // size)
+
+    # padding to a whole number of buckets lets every bucket be reduced at once. nans never win a min or max
+    low = np.full(buckets * size, np.inf)
+    low[:count] = np.where(np.isnan(values), np.inf, values)
+    high = np.full(buckets * size, -np.inf)
+    high[:count] = np.where(np.isnan(values), -np.inf, values)
+
+    starts = np.arange(buckets) * size
+    keep = np.concatenate([
+        starts,
+        np.minimum(starts + size - 1, count - 1),
+        low.reshape(buckets, size).argmin(axis=1) + starts,
+        high.reshape(buckets, size).argmax(axis=1) + starts,
+    ])
+    return np.unique(keep)
+
+
+def pixel_indices(x: np.ndarray, y: np.ndarray, width: int, height: int) -> np.ndarray:
+    # keeps the first point to land on each pixel, in their original order
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    x, y = x[finite], y[finite]
+    if not len(finite):
+        return finite
+
+    column = _scale(x, width)
+    row = _scale(y, height)
+    _, first = np.unique(column * height + row, return_index=True)
+    return finite[np.sort(first)]
+
+
+def reduce_line(x: Series, y: Series | DataFrame, size: tuple[int, int]) -> tuple[Series, Series | DataFrame]:
+    # with a frame of several series, every point any one of them needs is kept, so they can still share an x
+    width, _ = size
+    if len(y) <= POINTS_PER_PIXEL * width or not _numeric(y):
+        return x, y
+    keep = _union(minmax_indices(values, width) for values in _arrays(y))
+    return x.iloc[keep], y.iloc[keep]
+
+
+def reduce_scatter(x: Series, y: Series | DataFrame, size: tuple[int, int]) -> tuple[Series, Series | DataFrame]:
+    width, height = size
+    if len(y) <= POINTS_PER_PIXEL * width or not (is_numeric_dtype(x) and _numeric(y)):
+        return x, y
+    x_values = x.to_numpy(dtype=float)
+    keep = _union(pixel_indices(x_values, values, width, height) for values in _arrays(y))
+    return x.iloc[keep], y.iloc[keep]
+
+
+def _numeric(y: Series | DataFrame) -> bool:
+    return all(is_numeric_dtype(dtype) for dtype in y.dtypes) if isinstance(y, DataFrame) else is_numeric_dtype(y)
+
+
+def _arrays(y: Series | DataFrame) -> list[np.ndarray]:
+    if isinstance(y, DataFrame):
+        return [y.iloc[:, column].to_numpy(dtype=float) for column in range(y.shape[1])]
+    return [y.to_numpy(dtype=float)]
+
+
+def _union(indices) -> np.ndarray:
+    return np.unique(np.concatenate(list(indices)))
+
+
+def _scale(values: np.ndarray, pixels: int) -> np.ndarray:
+    low, high = values.min(), values.max()
+    if high == low:
+        return np.zeros(len(values), dtype=np.int64)
+    return ((values - low) / (high - low) * (pixels - 1)).astype(np.int64)
@@ -0,0 +1,74 @@
+from functools import wraps
+from inspect import Parameter, signature
+from math import ceil, sqrt
+from typing import Any, Callable, Optional
+
+from matplotlib.figure import Figure
+from pandas import DataFrame
+
+from .context import drawing_into, new_figure
+from .registry import ColumnName
+
+
+MAX_FACETS = 36 # past this, the cells are too small to read
+
+
+def faceted(function: Callable[..., Figure]) -> Callable[..., Figure]:
+    # adds a facet_by parameter to a plotter. given a column, the plot is drawn once for each of its values, as a grid
+    # of small copies in the one figure. the plotter must take its source first, and draw with new_axes
+    sig = signature(function)
+    source = next(iter(sig.parameters))
+    defaults = {name: param.default for name, param in sig.parameters.items() if param.default is not Parameter.empty}
+
+    @wraps(function)
+    def draw(*args, facet_by: Optional[str] = None, **kwargs) -> Figure:
+        if not facet_by:
+            return function(*args, **kwargs)
+        arguments = {**defaults, **sig.bind(*args, **kwargs).arguments}
+        return facet_grid(function, source, arguments, facet_by)
+
+    facet = Parameter('facet_by', Parameter.KEYWORD_ONLY, default=None, annotation=Optional[ColumnName])
+    draw.__signature__ = sig.replace(parameters=[*sig.parameters.values(), facet])
+    # the registry runs this with the rest of its column checks, so a grid too big to draw is refused before it's saved
+    draw.column_checks = [*getattr(function, 'column_checks', []), check_facets]
+    return draw
+
+
+def check_facets(
+    args: dict[str, Any], kinds: dict[str, str], cardinalities: dict[str, int] | None = None
+) -> list[str]:
+    # the problem facet_grid would raise, found from the number of distinct values the file's profile recorded
+    facet_by = args.get('facet_by')
+    if not facet_by or cardinalities is None or (values := cardinalities.get(str(facet_by))) is None:
+        return []
+    if not 0 < values <= MAX_FACETS:
+        return [f"Can't facet by '{facet_by}', which has {values} values. At most {MAX_FACETS} can be drawn."]
+    return []
+
+
+def facet_grid(function: Callable[..., Figure], source: str, arguments: dict[str, Any], facet_by: str) -> Figure:
+    # the source, named by the given argument, is split by a single groupby and every group is drawn into its own
+    # cell. each cell is half the chart's width and height, so four of them take up the room the chart would alone
+    frame: DataFrame = arguments[source]
+    groups = frame.groupby(facet_by, sort=True)
+    if not 0 < groups.ngroups <= MAX_FACETS:
+        raise ValueError(
+            f"Can't facet by {facet_by!r}, which has {groups.ngroups} values. At most {MAX_FACETS} can be drawn."
+        )
+
+    columns = ceil(sqrt(groups.ngroups))
+    rows = ceil(groups.ngroups / columns)
+    width, height = arguments.get('figsize', (10, 6))
+    cell = (width / 2, height / 2)
+
+    fig = new_figure((cell[0] * columns, cell[1] * rows))
+    axes = fig.subplots(rows, columns, squeeze=False).flatten()
+    for ax, (value, group) in zip(axes, groups):
+        with drawing_into(fig, ax):
+            function(**{**arguments, source: group, 'figsize': cell, 'title': f"{facet_by} = {value}"})
+    for ax in axes[groups.ngroups:]:
+        ax.set_visible(False)
+
+    if title := arguments.get('title'):
+        fig.suptitle(title)
+    return fig
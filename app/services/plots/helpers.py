@@ -1,20 +1,47 @@
-# reads the csv and defines frames
-import pandas as pd
 import os, uuid
+from hashlib import sha256
+from typing import TYPE_CHECKING
 from flask import current_app
 
-# does the graphing
-from matplotlib.figure import Figure
+# pandas and matplotlib are slow to import, so they're only pulled in by the functions that use them
+if TYPE_CHECKING:
+    import pandas as pd
+    from matplotlib.figure import Figure
+
+from .images import image_name, remove_renditions, save_renditions
 
 # useful for constructing file-like objects
 from io import BytesIO
 from base64 import b64encode
 
 
-def read_csv(file) -> pd.DataFrame:
-    return pd.read_csv(file, encoding='utf-8')
+DATE_SAMPLE = 100 # the number of values a text column is tried as dates on, before converting all of it
+
+
+def read_csv(file, usecols: list[str] | None = None, chunksize: int | None = None) -> 'pd.DataFrame':
+    # with a chunksize this gives back an iterator of frames instead. text columns holding iso 8601 dates are parsed
+    import pandas as pd
+    frames = pd.read_csv(file, encoding='utf-8', usecols=usecols, chunksize=chunksize)
+    if chunksize is None:
+        return parse_dates(frames)
+    return (parse_dates(frame) for frame in frames)
 
-def save_to_string(figure: Figure) -> str:
+def parse_dates(frame: 'pd.DataFrame') -> 'pd.DataFrame':
+    # converts text columns whose values are all iso 8601 dates or times into datetimes. offsets are converted to
+    # utc, so every datetime column is naive and can be stored as a plain array. other formats are too ambiguous
+    # to guess at, since names like 'March' would parse too
+    import pandas as pd
+    for name, series in frame.items():
+        if series.dtype != object or not len(present := series.dropna()):
+            continue
+        try:
+            pd.to_datetime(present.iloc[:DATE_SAMPLE], format='ISO8601', utc=True)
+            frame[name] = pd.to_datetime(series, format='ISO8601', utc=True).dt.tz_localize(None)
+        except (TypeError, ValueError):
+            continue
+    return frame
+
+def save_to_string(figure: 'Figure') -> str:
     with BytesIO() as buffer:
         figure.savefig(buffer, format='png')
         # we have to rewind so that we start reading from the beginning rather than the end
@@ -22,10 +49,27 @@ def save_to_string(figure: Figure) -> str:
         image = b64encode(buffer.read()).decode('utf-8')
     return image
 
-def save_figure_to_file(fig: Figure, chart_id: int) -> str:
+def save_figure_to_file(fig: 'Figure', chart_id: int) -> str:
     folder = current_app.config['IMAGE_FOLDER']
     os.makedirs(folder, exist_ok=True)
     fname = f"chart_{chart_id}_{uuid.uuid4().hex[:8]}.png"
     path = os.path.join(folder, fname)
-    fig.savefig(path, bbox_inches='tight')
+    fig.savefig(path)
     return fname
+
+def save_image_to_file(image: bytes, chart_id: int, svg: bytes | None = None) -> str:
+    # same as above, for a png that has already been rendered. thumbnails and other formats are saved alongside it.
+    # it's named after a hash of the image, so that its url can be cached forever
+    folder = current_app.config['IMAGE_FOLDER']
+    os.makedirs(folder, exist_ok=True)
+    fname = f"chart_{chart_id}_{sha256(image).hexdigest()[:16]}.png"
+    with open(os.path.join(folder, fname), 'wb') as file:
+        file.write(image)
+    save_renditions(image, fname, folder, current_app.config['CHART_THUMBNAIL_WIDTHS'], current_app.config['CHART_WEBP'])
+    if svg is not None:
+        with open(os.path.join(folder, image_name(fname, format='svg')), 'wb') as file:
+            file.write(svg)
+    return fname
+
+def remove_image_files(fname: str) -> None:
+    remove_renditions(fname, current_app.config['IMAGE_FOLDER'])
@@ -0,0 +1,55 @@
+from glob import escape, glob
+from io import BytesIO
+from os import path, remove
+from typing import Iterable
+
+
+def webp_supported() -> bool:
+    # pillow can be built without webp, in which case charts are only saved as png
+    from PIL import features
+    return features.check('webp')
+
+
+def image_name(fname: str, width: int | None = None, format: str = 'png') -> str:
+    # the name of one rendition of a saved chart. thumbnails are named after their width
+    stem, _ = path.splitext(fname)
+    return f"{stem}_{width}w.{format}" if width else f"{stem}.{format}"
+
+
+def image_width(image_path: str) -> int | None:
+    # reads the width straight out of a png's header rather than decoding the whole image
+    try:
+        with open(image_path, 'rb') as file:
+            header = file.read(24)
+    except OSError:
+        return None
+    if header[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return int.from_bytes(header[16:20], 'big')
+
+
+def save_renditions(image: bytes, fname: str, folder: str, widths: Iterable[int], webp: bool = True) -> None:
+    # writes scaled down copies of a saved chart next to it, along with webp versions of each where we can
+    from PIL import Image
+
+    formats = ['png', 'webp'] if webp and webp_supported() else ['png']
+    with Image.open(BytesIO(image)) as full:
+        full.load()
+        if 'webp' in formats:
+            full.save(path.join(folder, image_name(fname, format='webp')), 'WEBP', quality=90, method=6)
+
+        for width in widths:
+            if width >= full.width:
+                continue
+            scaled = full.resize((width, max(round(full.height * width / full.width), 1)), Image.LANCZOS)
+            for format in formats:
+                options = {'optimize': True} if format == 'png' else {'quality': 90, 'method': 6}
+                scaled.save(path.join(folder, image_name(fname, width, format)), format.upper(), **options)
+
+
+def remove_renditions(fname: str, folder: str) -> None:
+    # removes a saved chart along with every other rendition of it
+    stem, _ = path.splitext(path.basename(fname))
+    for pattern in ('.*', '_*'):
+        for image_path in glob(path.join(escape(folder), escape(stem) + pattern)):
+            remove(image_path)
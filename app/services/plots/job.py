@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class PlotJob:
+    graph_type: str
+    spec: dict[str, Any]
+    key: str       # the storage key of the file being drawn
+    blob_path: str # where that file can be read from
+    chunked_above: int | None = None
+    format: str = 'png'
+    options: dict[str, Any] = field(default_factory=dict) # passed on to savefig
@@ -1,86 +1,140 @@
-from typing import Optional
+from typing import Annotated, Optional
 
 import matplotlib
 # force non-interactive backend before importing pyplot
 matplotlib.use('Agg')
 from matplotlib.figure import Figure
 
-from pandas import DataFrame
+from pandas import DataFrame, Series, factorize
 
-from app.services.plots.registry import PlotRegistry
+from app.services.plots.aggregate import aggregated
+from app.services.plots.chunked import Chunks, histogram_counts, value_counts
+from app.services.plots.context import new_axes
+from app.services.plots.decimate import pixel_size, reduce_line, reduce_scatter
+from app.services.plots.facets import faceted
+from app.services.plots.registry import PlotRegistry, Column, ColumnName, NumericColumn, NumericColumns
 from typing import Optional
 
+# bools, numbers, strings, optionals and tuples are all converted by the registry. only types it can't convert
+# need remapping
 registry = PlotRegistry(remaps={
-    bool: lambda string: string.lower() == 'true',
-    str:str,
-    Optional[str]: str
+    # sources are passed through as they are, since chunked plotters are given something other than a frame
+    DataFrame: lambda source: source,
 })
 
-@registry.register_as('line')
+@registry.register_as('line', version=2)
+@faceted
+@aggregated
 def plot_line(
     source: DataFrame,
-    x_col: str, y_col: str,
+    x_col: ColumnName, y_col: NumericColumns,
     title: str = 'Line Plot', x_label: Optional[str] = None, y_label: Optional[str] = None,
-    color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True
+    color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True, decimate: bool = True
 ) -> Figure:
-    fig = Figure(figsize=figsize)
-    ax  = fig.add_subplot(1, 1, 1)
-    ax.plot(source[x_col], source[y_col], color=color)
-    ax.set(title=title, xlabel=x_label or x_col, ylabel=y_label or y_col)
-    ax.grid(visible=grid)
+    y_col = _as_list(y_col)
+    fig, ax = new_axes(figsize)
+    x, y = source[x_col], source[y_col]
+    if decimate:
+        x, y = reduce_line(x, y, pixel_size(figsize, fig.dpi))
+    # every series is drawn by the one call, against their shared x
+    ax.set_prop_cycle(color=_colors(color, len(y_col)))
+    ax.plot(x, y.to_numpy(), label=y_col)
+    _label(ax, title, x_label or x_col, y_label, y_col, grid)
     return fig
 
-@registry.register_as('scatter')
+@registry.register_as('scatter', version=2)
+@faceted
 def plot_scatter(
     source: DataFrame,
-    x_col: str, y_col: str,
+    x_col: Annotated[str, Column('numeric', 'datetime')], y_col: NumericColumns,
     title: str = 'Scatter Plot', x_label: Optional[str] = None, y_label: Optional[str] = None,
-    color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True
+    color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True, decimate: bool = True
 ) -> Figure:
-    fig = Figure(figsize=figsize)
-    ax  = fig.add_subplot(1, 1, 1)
-    ax.scatter(source[x_col], source[y_col], color=color)
-    ax.set(title=title, xlabel=x_label or x_col, ylabel=y_label or y_col)
-    ax.grid(visible=grid)
+    y_col = _as_list(y_col)
+    fig, ax = new_axes(figsize)
+    x, y = source[x_col], source[y_col]
+    if decimate:
+        x, y = reduce_scatter(x, y, pixel_size(figsize, fig.dpi))
+    for name, series_color in zip(y_col, _colors(color, len(y_col))):
+        ax.scatter(x, y[name], color=series_color, label=name)
+    _label(ax, title, x_label or x_col, y_label, y_col, grid)
     return fig
 
-@registry.register_as('bar')
+@registry.register_as('bar', version=2)
+@faceted
+@aggregated
 def plot_bar(
     source: DataFrame,
-    x_col: str, y_col: str,
+    x_col: ColumnName, y_col: NumericColumns,
     title: str = 'Bar Chart', x_label: Optional[str] = None, y_label: Optional[str] = None,
     color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True
 ) -> Figure:
-    fig = Figure(figsize=figsize)
-    ax  = fig.add_subplot(1, 1, 1)
-    ax.bar(source[x_col], source[y_col], color=color)
-    ax.set(title=title, xlabel=x_label or x_col, ylabel=y_label or y_col)
-    ax.grid(visible=grid)
+    y_col = _as_list(y_col)
+    fig, ax = new_axes(figsize)
+    if len(y_col) == 1:
+        ax.bar(source[x_col], source[y_col[0]], color=color)
+    else:
+        # several series are grouped, with one bar per series side by side at each x
+        positions, labels = factorize(source[x_col])
+        width = 0.8 / len(y_col)
+        for index, (name, series_color) in enumerate(zip(y_col, _colors(color, len(y_col)))):
+            offset = (index - (len(y_col) - 1) / 2) * width
+            ax.bar(positions + offset, source[name], width, color=series_color, label=name)
+        ax.set_xticks(range(len(labels)), [str(label) for label in labels])
+    _label(ax, title, x_label or x_col, y_label, y_col, grid)
     return fig
 
-@registry.register_as('histogram')
+@registry.register_as('histogram', version=2)
+@faceted
 def plot_histogram(
     source: DataFrame,
-    column: str, bins: int = 10,
+    column: NumericColumn, bins: int = 10,
     title: str = 'Histogram', x_label: Optional[str] = None, y_label: Optional[str] = None,
     color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True
 ) -> Figure:
-    fig = Figure(figsize=figsize)
-    ax  = fig.add_subplot(1, 1, 1)
+    fig, ax = new_axes(figsize)
     ax.hist(source[column], bins=bins, color=color)
     ax.set(title=title, xlabel=x_label or column, ylabel=y_label or 'Frequency')
     ax.grid(visible=grid)
     return fig
 
-@registry.register_as('pie')
+@registry.chunked_for('histogram')
+def plot_histogram_chunked(
+    source: Chunks,
+    column: str, bins: int = 10,
+    title: str = 'Histogram', x_label: Optional[str] = None, y_label: Optional[str] = None,
+    color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True
+) -> Figure | None:
+    if (binned := histogram_counts(source, column, bins)) is None:
+        return None
+    counts, edges = binned
+
+    fig, ax = new_axes(figsize)
+    # weighting one value per bin by its count draws the same bars as passing every value
+    ax.hist(edges[:-1], bins=edges, weights=counts, color=color)
+    ax.set(title=title, xlabel=x_label or column, ylabel=y_label or 'Frequency')
+    ax.grid(visible=grid)
+    return fig
+
+@registry.register_as('pie', version=2)
+@faceted
 def plot_pie(
     source: DataFrame,
+    column: ColumnName, angle: float = 90,
+    title: str = 'Pie Chart', figsize: tuple[int, int] = (10, 6)
+) -> Figure:
+    return _draw_pie(source[column].value_counts(), angle, title, figsize)
+
+@registry.chunked_for('pie')
+def plot_pie_chunked(
+    source: Chunks,
     column: str, angle: float = 90,
     title: str = 'Pie Chart', figsize: tuple[int, int] = (10, 6)
 ) -> Figure:
-    fig = Figure(figsize=figsize)
-    ax  = fig.add_subplot(1, 1, 1)
-    counts = source[column].value_counts()
+    return _draw_pie(value_counts(source, column), angle, title, figsize)
+
+def _draw_pie(counts: Series, angle: float, title: str, figsize: tuple[int, int]) -> Figure:
+    fig, ax = new_axes(figsize)
     ax.pie(
         counts,
         startangle=angle,
@@ -90,30 +144,53 @@ def plot_pie(
     ax.set(title=title)
     return fig
 
-@registry.register_as('area')
+@registry.register_as('area', version=2)
+@faceted
+@aggregated
 def plot_area(
     source: DataFrame,
-    x_col: str, y_col: str,
+    x_col: ColumnName, y_col: NumericColumns,
     title: str = 'Area Plot', x_label: Optional[str] = None, y_label: Optional[str] = None,
-    color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True
+    color: str = 'blue', figsize: tuple[int, int] = (10, 6), grid: bool = True, decimate: bool = True
 ) -> Figure:
-    fig = Figure(figsize=figsize)
-    ax  = fig.add_subplot(1, 1, 1)
-    ax.stackplot(source[x_col], source[y_col], color=color)
-    ax.set(title=title, xlabel=x_label or x_col, ylabel=y_label or y_col)
-    ax.grid(visible=grid)
+    y_col = _as_list(y_col)
+    fig, ax = new_axes(figsize)
+    x, y = source[x_col], source[y_col]
+    if decimate:
+        x, y = reduce_line(x, y, pixel_size(figsize, fig.dpi))
+    # several series are stacked on top of each other
+    ax.stackplot(x, y.to_numpy().T, colors=_colors(color, len(y_col)), labels=y_col)
+    _label(ax, title, x_label or x_col, y_label, y_col, grid)
     return fig
 
-@registry.register_as('box')
+@registry.register_as('box', version=2)
+@faceted
 def plot_box(
     source: DataFrame,
-    x_col: str, y_col: str,
+    x_col: ColumnName, y_col: NumericColumn,
     title: str = 'Box Plot', x_label: Optional[str] = None, y_label: Optional[str] = None,
     figsize: tuple[int, int] = (10, 6), grid: bool = True
 ) -> Figure:
-    fig = Figure(figsize=figsize)
-    ax  = fig.add_subplot(1, 1, 1)
+    fig, ax = new_axes(figsize)
     source.boxplot(column=y_col, by=x_col, ax=ax)
+    # pandas adds its own 'grouped by' title above ours, which there's no room for
+    fig.suptitle('')
     ax.set(title=title, xlabel=x_label or x_col, ylabel=y_label or y_col)
     ax.grid(visible=grid)
     return fig
+
+def _as_list(y_col: str | list[str]) -> list[str]:
+    # specs are bound to a list, but the plotters can also be called with a single column
+    return [y_col] if isinstance(y_col, str) else list(y_col)
+
+def _colors(color: str, count: int) -> list[str]:
+    # the first series takes the chosen colour, and the rest follow matplotlib's own cycle
+    cycle = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+    return [color] + [cycle[index % len(cycle)] for index in range(1, count)]
+
+def _label(ax, title: str, x_label: str, y_label: str | None, y_cols: list[str], grid: bool) -> None:
+    # a chart of one series is labelled by it, while a chart of several gets a legend to tell them apart
+    ax.set(title=title, xlabel=x_label, ylabel=y_label or ', '.join(y_cols))
+    if len(y_cols) > 1:
+        ax.legend()
+    ax.grid(visible=grid)
@@ -0,0 +1,119 @@
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from threading import Lock
+from weakref import WeakSet
+
+from flask import Flask
+
+from ..data import frame_cache
+from .job import PlotJob
+from .render_cache import RenderCache, render_cache
+
+
+class RenderTimeout(RuntimeError):
+
+    def __init__(self, seconds: float) -> None:
+        super().__init__(f"Rendering took longer than {seconds:g} seconds.")
+
+
+def _start_worker(cache_bytes: int) -> None:
+    # each worker keeps its own frame cache, so repeated renders of the same file stay warm
+    from .context import warm_up
+    frame_cache.budget = cache_bytes
+    warm_up()
+
+
+def _draw(job: PlotJob) -> bytes:
+    # matplotlib and pandas are only imported once something is drawn, so the rest of the app doesn't pay for them
+    from .context import warm_up
+    from .render import render_image
+
+    warm_up()
+    return render_image(job)
+
+
+class RenderPool:
+    workers: int   # the number of worker processes. with none, jobs are rendered on the calling thread
+    timeout: float # the number of seconds a job may take before it is abandoned
+
+    def __init__(self, workers: int = 0, timeout: float = 60, cache: RenderCache | None = None) -> None:
+        self.workers, self.timeout, self.cache = workers, timeout, cache
+        self.cache_bytes = frame_cache.budget
+        self._executor: ProcessPoolExecutor | None = None
+        self._timed_out: WeakSet[ProcessPoolExecutor] = WeakSet()
+        self._lock = Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.shutdown()
+        self.workers = app.config.get('RENDER_WORKERS', self.workers)
+        self.timeout = app.config.get('RENDER_TIMEOUT', self.timeout)
+        self.cache_bytes = app.config.get('DATAFRAME_CACHE_BYTES', self.cache_bytes)
+
+    def render(self, job: PlotJob) -> bytes:
+        # jobs whose inputs haven't changed since they were last drawn come straight from the cache
+        key = self.cache.key_for(job) if self.cache else None
+        if key and (image := self.cache.get(key)) is not None:
+            return image
+
+        image = self._render(job)
+        if key:
+            self.cache.put(key, image)
+        return image
+
+    def _render(self, job: PlotJob) -> bytes:
+        if not self.workers:
+            return _draw(job)
+
+        # a job that runs too long has its worker killed and times out. a job that loses its worker, or its place in
+        # the queue, to another job's timeout did nothing wrong, so it's simply sent again. only a pool that broke by
+        # itself, like a worker crashing, counts against the job, which gets one more go
+        failures = 0
+        while True:
+            future, executor = self._submit(job)
+            try:
+                return future.result(timeout=self.timeout)
+            except TimeoutError:
+                # a running job can't be cancelled, so its worker is killed instead
+                self._restart(executor, timed_out=True)
+                raise RenderTimeout(self.timeout)
+            except (BrokenProcessPool, CancelledError):
+                if executor in self._timed_out:
+                    continue
+                self._restart(executor)
+                failures += 1
+                if failures > 1:
+                    raise
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, job: PlotJob) -> tuple[Future, ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None:
+                # workers are spawned rather than forked, since forking a threaded server can copy held locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=get_context('spawn'),
+                    initializer=_start_worker, initargs=(self.cache_bytes,),
+                )
+            return self._executor.submit(_draw, job), self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor, timed_out: bool = False) -> None:
+        # only the first job to give up on an executor restarts it, the rest find it already replaced. executors
+        # restarted for a timeout are marked before their workers are killed, so the jobs that go down with them know
+        # to try again. processes are looked up before shutting down, since shutting down forgets them
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            if timed_out:
+                self._timed_out.add(executor)
+            processes = list((executor._processes or {}).values())
+        for process in processes:
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+render_pool = RenderPool(cache=render_cache)
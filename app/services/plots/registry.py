@@ -1,14 +1,190 @@
-from typing import Any, Callable
+from math import isfinite
+from re import split
+from types import NoneType, UnionType
+from typing import Annotated, Any, Callable, Literal, Union, get_args, get_origin
 from inspect import Parameter, signature
 
 
+JSON_SCHEMA = 'https://json-schema.org/draft/2020-12/schema'
+TRUE, FALSE = {'true', '1', 'yes', 'on'}, {'false', '0', 'no', 'off'}
+
+
+KINDS = ('numeric', 'categorical', 'datetime') # the kinds of column a file's profile tells apart
+
+
+class Column:
+    # marks a plotter parameter as naming a column of its source, so callers know what to load. it can also say which
+    # kinds of column it accepts, so that a spec can be checked against a file's profile without loading any data
+    kinds: tuple[str, ...]
+
+    def __init__(self, *kinds: str) -> None:
+        if unknown := [kind for kind in kinds if kind not in KINDS]:
+            raise ValueError(f"Unknown column kinds {unknown}, expected some of {KINDS}")
+        self.kinds = kinds
+
+
+ColumnName = Annotated[str, Column()]
+NumericColumn = Annotated[str, Column('numeric')]
+NumericColumns = Annotated[list[str], Column('numeric')] # one or more columns, drawn as a series each
+
+
 def unbound_error(param_name: str, f_name: str) -> str:
     return f"Couldn't find parameter {param_name!r} in {f_name}"
 
 
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in TRUE | FALSE:
+        return value.strip().lower() in TRUE
+    raise ValueError(value)
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise TypeError(value)
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(value)
+    try:
+        return int(value)
+    except ValueError:
+        # allows '10.0', but not '10.5'
+        return _to_int(float(value))
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise TypeError(value)
+    number = float(value)
+    if not isfinite(number):
+        raise ValueError(value)
+    return number
+
+
+def _to_str(value: Any) -> str:
+    # numbers are fine as strings, but anything else would only be its repr
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise TypeError(value)
+    return str(value)
+
+
+def _items(value: Any) -> list:
+    # sequences can also be written out as strings, like a figsize of '10x6' or '10, 6'
+    if isinstance(value, str):
+        value = [part for part in split(r'[xX,\s]+', value.strip()) if part]
+    if not isinstance(value, (list, tuple)):
+        raise TypeError(value)
+    return list(value)
+
+
+COERCERS: dict[Any, Callable[[Any], Any]] = {bool: _to_bool, int: _to_int, float: _to_float, str: _to_str}
+
+
+def _coercer(annotation: Any) -> Callable[[Any], Any]:
+    # builds a function converting whatever a spec holds into the given type, raising TypeError or ValueError where
+    # it can't. this is done once per parameter when a plotter is registered, rather than each time one is bound
+    origin, args = get_origin(annotation), get_args(annotation)
+
+    if annotation is Parameter.empty or annotation is Any:
+        return lambda value: value
+    if annotation in COERCERS:
+        return COERCERS[annotation]
+    if origin is Annotated:
+        return _coercer(args[0])
+
+    if origin in (Union, UnionType):
+        options = [_coercer(arg) for arg in args if arg is not NoneType]
+        def coerce_union(value: Any) -> Any:
+            if value is None and NoneType in args:
+                return None
+            for option in options:
+                try:
+                    return option(value)
+                except (TypeError, ValueError):
+                    pass
+            raise ValueError(value)
+        return coerce_union
+
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            item = _coercer(args[0])
+            return lambda value: tuple(item(part) for part in _items(value))
+        items = [_coercer(arg) for arg in args]
+        def coerce_tuple(value: Any) -> tuple:
+            parts = _items(value)
+            if len(parts) != len(items):
+                raise ValueError(value)
+            return tuple(item(part) for item, part in zip(items, parts))
+        return coerce_tuple
+
+    if origin is list:
+        item = _coercer(args[0]) if args else _coercer(Any)
+        # a single value is taken as a list of one
+        return lambda value: [item(part) for part in (value if isinstance(value, (list, tuple)) else [value])]
+
+    if origin is Literal:
+        def coerce_literal(value: Any) -> Any:
+            if value not in args:
+                raise ValueError(value)
+            return value
+        return coerce_literal
+
+    # anything else is expected to convert values itself
+    return annotation
+
+
+SCHEMAS: dict[Any, dict[str, Any]] = {
+    bool: {'type': 'boolean'}, int: {'type': 'integer'}, float: {'type': 'number'}, str: {'type': 'string'},
+    NoneType: {'type': 'null'},
+}
+
+
+def _schema(annotation: Any) -> dict[str, Any]:
+    # the json schema describing the values a parameter of the given type takes. types it can't describe take anything
+    origin, args = get_origin(annotation), get_args(annotation)
+
+    if annotation in SCHEMAS:
+        return dict(SCHEMAS[annotation])
+    if origin is Annotated:
+        return _schema(args[0])
+    if origin in (Union, UnionType):
+        return {'anyOf': [_schema(arg) for arg in args]}
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return {'type': 'array', 'items': _schema(args[0])}
+        return {
+            'type': 'array', 'prefixItems': [_schema(arg) for arg in args], 'items': False,
+            'minItems': len(args), 'maxItems': len(args),
+        }
+    if origin is list:
+        return {'type': 'array', 'items': _schema(args[0]) if args else {}}
+    if origin is Literal:
+        return {'enum': list(args)}
+    return {}
+
+
+def _column(annotation: Any) -> Column | None:
+    # the column marker on an annotation, which optional columns have on the type they wrap
+    if get_origin(annotation) is Annotated:
+        return next((data for data in get_args(annotation)[1:] if isinstance(data, Column)), None)
+    if get_origin(annotation) in (Union, UnionType):
+        return next((column for arg in get_args(annotation) if (column := _column(arg))), None)
+    return None
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return value
+
+
 class BindError(Exception):
 
     def __init__(self, missing: list[str], errors: list[tuple[str, Any]], unbound: list[str], func_name: str) -> None:
+        # keeping the arguments lets the error be pickled back out of a render worker
+        super().__init__(missing, errors, unbound, func_name)
         self._missing, self._errors, self._unbound = missing, errors, unbound
         self._name = func_name
 
@@ -22,27 +198,65 @@ class BindError(Exception):
         return [name for name in self._unbound]
 
 
+class ColumnError(Exception):
+
+    def __init__(self, problems: list[str]) -> None:
+        super().__init__(problems)
+        self.problems = problems
+
+    def __str__(self) -> str:
+        return ' '.join(self.problems)
+
+
 class PlotterFunction:
     function: Callable
     required: list[str] # parameters that don't have a default value will be required
     optional: list[str] # parameters that do have a default value will be optional
     combined: list[str] # contains the total list of parameter names
+    columns: list[str] # parameters that name columns of the source
+    column_kinds: dict[str, tuple[str, ...]] # the kinds of column each of those accepts, where they're limited
+    column_checks: list[Callable] # checks of columns that depend on other arguments, given by the plotter's decorators
     annotations: dict[str, Callable] # maps between parameter name and type
+    coercers: dict[str, Callable] # converts the values given for each parameter into its type
+    defaults: dict[str, Any] # the values optional parameters take when they aren't given
+    chunked: Callable | None # draws the same plot from a source of chunks, for files too big to load at once
+    series: Callable | None # gives the arrays the plot would draw, for clients that draw it themselves
+    version: int # bumped whenever the plotter's output changes, so previously rendered images aren't reused
 
-    def __init__(self, function: Callable, remaps: dict[Callable, Callable]) -> None:
+    def __init__(self, function: Callable, remaps: dict[Callable, Callable], version: int = 1) -> None:
         sig = signature(function)
 
         self.function = function
-        self.required, self.optional, self.combined  = [], [], []
-        self.annotations = dict()
+        self.chunked, self.series = None, None
+        self.version = version
+        self.required, self.optional, self.combined, self.columns = [], [], [], []
+        self.column_kinds = dict()
+        self.column_checks = list(getattr(function, 'column_checks', []))
+        self.annotations, self.defaults, self.coercers = dict(), dict(), dict()
+        self._types: dict[str, Any] = dict()
+        self._names = frozenset(sig.parameters)
 
         for name, param in sig.parameters.items():
             self.combined.append(name)
-            self.annotations[name] = remaps.get(param.annotation, param.annotation)
+
+            annotation = param.annotation
+            if column := _column(annotation):
+                self.columns.append(name)
+                if column.kinds:
+                    self.column_kinds[name] = column.kinds
+            if get_origin(annotation) is Annotated:
+                annotation = get_args(annotation)[0]
+
+            self.annotations[name] = remaps.get(annotation, annotation)
+            self._types[name] = annotation
+            # remapped types keep the conversion they were given, everything else is converted by its type
+            remapped = self.annotations[name] is not annotation
+            self.coercers[name] = self.annotations[name] if remapped else _coercer(annotation)
             if param.default is Parameter.empty:
                 self.required.append(name)
             else:
                 self.optional.append(name)
+                self.defaults[name] = param.default
 
     def bind_args(self, **kwargs) -> tuple[dict[str, Any], list[str]]:
         # finds any args that should be present but are not
@@ -50,10 +264,10 @@ class PlotterFunction:
 
         # attempts to cast arguments to the appropriate type and makes note of errors
         errors = []
-        bound = {name: self._cast(name, value, errors) for name, value in kwargs.items() if name in self.combined}
+        bound = {name: self._cast(name, value, errors) for name, value in kwargs.items() if name in self._names}
 
         # makes note of any arguments that are present but unexpected
-        unbound = [unbound_error(arg, self.function.__name__) for arg in kwargs.keys() if arg not in self.combined]
+        unbound = [unbound_error(arg, self.function.__name__) for arg in kwargs.keys() if arg not in self._names]
 
         # missing arguments or failed conversions will raise an error
         if missing or errors:
@@ -61,16 +275,71 @@ class PlotterFunction:
 
         return bound, unbound
 
+    def used_columns(self, args: dict[str, Any]) -> list[str]:
+        # the columns named by the given arguments, in order and without repeats
+        used = []
+        for name in self.columns:
+            value = args.get(name)
+            for column in (value if isinstance(value, list) else [value]):
+                if column and str(column) not in used:
+                    used.append(str(column))
+        return used
+
+    def check_columns(
+        self, args: dict[str, Any], kinds: dict[str, str], cardinalities: dict[str, int] | None = None
+    ) -> None:
+        # checks the columns named by the given arguments against the kind of each column in the file, as its
+        # profile records them, raising a ColumnError listing every problem. given the number of distinct values in
+        # each column too, the plotter's own checks can also check those
+        problems = []
+        for name in self.columns:
+            value = args.get(name)
+            for column in (value if isinstance(value, list) else [value]):
+                if not column:
+                    continue
+                kind = kinds.get(str(column))
+                if kind is None:
+                    problems.append(f"Column '{column}' not found.")
+                elif name in self.column_kinds and kind not in self.column_kinds[name]:
+                    allowed = ' or '.join(self.column_kinds[name])
+                    problems.append(f"{name} must be a {allowed} column, but '{column}' is {kind}.")
+        for check in self.column_checks:
+            problems.extend(check(args, kinds, cardinalities))
+        if problems:
+            raise ColumnError(problems)
+
     def list_args(self) -> list[dict[str, str]]:
         output = []
         output.extend([{'name': name, 'required': 'true'} for name in self.required])
         output.extend([{'name': name, 'required': 'false'} for name in self.optional])
         return output
 
+    def schema(self, title: str | None = None) -> dict[str, Any]:
+        # a json schema for the specs this plotter accepts, so clients can check them before sending them. the source
+        # is filled in by the server, so it isn't part of a spec
+        properties = dict()
+        for name in self.combined:
+            if name == 'source':
+                continue
+            properties[name] = _schema(self._types[name])
+            if name in self.columns:
+                properties[name]['x-column'] = True
+            if name in self.column_kinds:
+                properties[name]['x-column-kinds'] = list(self.column_kinds[name])
+            if name in self.defaults and isinstance(self.defaults[name], (bool, int, float, str, list, tuple, NoneType)):
+                properties[name]['default'] = _json_value(self.defaults[name])
+
+        return {
+            '$schema': JSON_SCHEMA,
+            'title': title or self.function.__name__,
+            'type': 'object',
+            'properties': properties,
+            'required': [name for name in self.required if name != 'source'],
+        }
+
     def _cast(self, name: str, value: Any, errors: list) -> Any:
         try:
-            cast_func = self.annotations[name]
-            return cast_func(value) if cast_func is not Parameter.empty else value
+            return self.coercers[name](value)
         except (TypeError, ValueError):
             errors.append((value, name))
             return None
@@ -86,9 +355,9 @@ class PlotRegistry:
         self._common_options = []
         self._remaps = remaps or dict()
 
-    def register_as(self, name: str) -> Callable:
+    def register_as(self, name: str, version: int = 1) -> Callable:
         def register(function: Callable) -> Callable:
-            plotter = PlotterFunction(function, self._remaps)
+            plotter = PlotterFunction(function, self._remaps, version)
 
             if not self._common_options:
                 self._common_options = [
@@ -108,6 +377,30 @@ class PlotRegistry:
 
         return register
 
+    def chunked_for(self, name: str) -> Callable:
+        # registers a version of an existing plotter that takes a callable giving an iterator of chunks as its source.
+        # it may return None if it can't draw a particular plot that way
+        def register(function: Callable) -> Callable:
+            self.functions[name].chunked = function
+            return function
+
+        if name not in self.functions:
+            raise RuntimeError(f"Cannot register a chunked version of {name!r} as it hasn't been registered")
+
+        return register
+
+    def series_for(self, name: str) -> Callable:
+        # registers a function giving the data an existing plotter would draw, as a dict of named arrays. it is
+        # passed every argument the plotter would be, with defaults filled in
+        def register(function: Callable) -> Callable:
+            self.functions[name].series = function
+            return function
+
+        if name not in self.functions:
+            raise RuntimeError(f"Cannot register series for {name!r} as it hasn't been registered")
+
+        return register
+
     def list_plots(self) -> list[dict[str, str]]:
         return [{'name': name} for name in self.functions.keys()]
 
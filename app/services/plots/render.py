@@ -0,0 +1,41 @@
+from inspect import signature
+from io import BytesIO
+from os import path
+from typing import Any
+
+from matplotlib.figure import Figure
+
+from ..data import iter_chunks
+from .aggregate import load_aggregated
+from .job import PlotJob
+from .plotters import registry
+
+
+def render_figure(
+    graph_type: str, spec: dict[str, Any], key: str, blob_path: str, chunked_above: int | None = None
+) -> Figure:
+    # loads only the columns the plotter will actually draw, then binds and draws them. files bigger than
+    # chunked_above are streamed through the plotter's chunked version instead, where it has one. faceted plots
+    # need the whole frame to split, so are never chunked
+    plotter = registry.functions[graph_type]
+    spec = {name: value for name, value in spec.items() if name not in ('graph_type', 'source')}
+    columns = plotter.used_columns(spec)
+
+    chunkable = plotter.chunked and not spec.get('facet_by')
+    if chunkable and chunked_above is not None and path.getsize(blob_path) > chunked_above:
+        bound, _ = plotter.bind_args(source=lambda: iter_chunks(blob_path, columns), **spec)
+        # options only the whole plotter has, like an empty facet_by, aren't passed on to the chunked one
+        accepted = signature(plotter.chunked).parameters
+        if (fig := plotter.chunked(**{name: value for name, value in bound.items() if name in accepted})) is not None:
+            return fig
+
+    # charts that aggregate are drawn from the aggregated frame, rather than every row
+    bound, _ = plotter.bind_args(source=None, **spec)
+    return plotter.function(**load_aggregated(key, blob_path, bound, columns))
+
+
+def render_image(job: PlotJob) -> bytes:
+    fig = render_figure(job.graph_type, job.spec, job.key, job.blob_path, chunked_above=job.chunked_above)
+    with BytesIO() as buffer:
+        fig.savefig(buffer, format=job.format, **job.options)
+        return buffer.getvalue()
@@ -0,0 +1,133 @@
+from contextlib import suppress
+from hashlib import sha256
+from json import dumps
+from os import makedirs, path, remove, replace, scandir, utime
+from tempfile import mkstemp
+from threading import Lock
+
+from flask import Flask
+
+from ..data import blob_digest
+from .job import PlotJob
+
+
+class RenderCache:
+    folder: str | None # where rendered images are kept. without one, nothing is cached
+    budget: int        # the total number of bytes the cached images are allowed to take up
+
+    def __init__(self, folder: str | None = None, budget: int = 256 * 1024 * 1024) -> None:
+        self.folder, self.budget = folder, budget
+        # our running estimate of the folder's size. other processes write to it too, so it is only a hint
+        self._size: int | None = None
+        self._lock = Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.folder = app.config.get('RENDER_CACHE_FOLDER', self.folder)
+        self.budget = app.config.get('RENDER_CACHE_BYTES', self.budget)
+        self._size = None
+
+    def key_for(self, job: PlotJob) -> str | None:
+        # the same plot of the same data drawn by the same plotter gets the same key, however its spec was written.
+        # files stored before uploads were content addressed have nothing to key on, so aren't cached
+        from .plotters import registry
+
+        digest = blob_digest(job.key)
+        plotter = registry.functions.get(job.graph_type)
+        if not self.folder or digest is None or plotter is None:
+            return None
+
+        spec = {name: value for name, value in job.spec.items() if name not in ('graph_type', 'source')}
+        try:
+            bound, _ = plotter.bind_args(source=None, **spec)
+        except Exception:
+            # specs that can't be bound aren't cached. rendering them will report the problem
+            return None
+        bound.pop('source')
+
+        inputs = {
+            'graph_type': job.graph_type, 'version': plotter.version, 'data': digest,
+            'spec': {**plotter.defaults, **bound},
+            'chunked_above': job.chunked_above, 'format': job.format, 'options': job.options,
+        }
+        return sha256(dumps(inputs, sort_keys=True, default=repr).encode()).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        if not self.folder:
+            return None
+        image_path = self._path(key)
+        try:
+            with open(image_path, 'rb') as file:
+                image = file.read()
+            # eviction goes by modification time, so touching the image marks it as recently used
+            utime(image_path)
+        except OSError:
+            return None
+        return image
+
+    def put(self, key: str, image: bytes) -> None:
+        if not self.folder or len(image) > self.budget:
+            return
+
+        # written to a temporary file first, so other processes never read half an image
+        image_path = self._path(key)
+        makedirs(path.dirname(image_path), exist_ok=True)
+        handle, temp_path = mkstemp(dir=path.dirname(image_path), suffix='.part')
+        try:
+            with open(handle, 'wb') as temp:
+                temp.write(image)
+            replace(temp_path, image_path)
+        except OSError:
+            with suppress(OSError):
+                remove(temp_path)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            self._size += len(image)
+            if self._size > self.budget:
+                self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, image_path in self._entries():
+                with suppress(OSError):
+                    remove(image_path)
+            self._size = 0
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.folder) and path.exists(self._path(key))
+
+    def _path(self, key: str) -> str:
+        return path.join(self.folder, key[:2], f"{key}.img")
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        # (modification time, size, path) of every cached image
+        entries = []
+        with suppress(FileNotFoundError), scandir(self.folder) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with suppress(FileNotFoundError), scandir(shard.path) as images:
+                    for image in images:
+                        if image.name.endswith('.img'):
+                            with suppress(FileNotFoundError):
+                                stat = image.stat()
+                                entries.append((stat.st_mtime, stat.st_size, image.path))
+        return entries
+
+    def _evict(self) -> None:
+        # the folder itself is the only thing every process agrees on, so eviction works from what is on disk.
+        # it frees a little more than needed, so that we aren't scanning again on the very next put
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        for _, image_size, image_path in entries:
+            if size <= self.budget * 0.9:
+                break
+            with suppress(FileNotFoundError):
+                remove(image_path)
+            size -= image_size
+        self._size = size
+
+
+render_cache = RenderCache()
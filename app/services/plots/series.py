@@ -0,0 +1,101 @@
+from typing import Any
+
+import numpy as np
+from matplotlib.cbook import boxplot_stats
+from pandas import DataFrame
+
+from .aggregate import load_aggregated
+from .decimate import pixel_size, reduce_line, reduce_scatter
+from .plotters import registry
+
+Arrays = dict[str, np.ndarray]
+
+
+def series_for_spec(
+    graph_type: str, spec: dict[str, Any], key: str, blob_path: str, kinds: dict[str, str] | None = None
+) -> tuple[Arrays, dict[str, Any]]:
+    # the arrays a chart would draw, reduced to what its figure can show, along with the rest of its options. given
+    # the kinds of the file's columns, the spec is checked against them before anything is loaded
+    plotter = registry.functions[graph_type]
+    if plotter.series is None:
+        raise ValueError(f"{graph_type!r} charts can't be drawn from series.")
+
+    spec = {name: value for name, value in spec.items() if name not in ('graph_type', 'source')}
+    bound, _ = plotter.bind_args(source=None, **spec)
+    if bound.get('facet_by'):
+        raise ValueError("Faceted charts can't be drawn from series.")
+    if kinds is not None:
+        plotter.check_columns(bound, kinds)
+    bound = load_aggregated(key, blob_path, bound, plotter.used_columns(bound))
+
+    args = {**plotter.defaults, **bound}
+    options = {name: value for name, value in args.items() if name != 'source'}
+    return plotter.series(**args), options
+
+
+def series_to_json(arrays: Arrays) -> dict[str, list]:
+    # nans become nulls and dates become iso strings, since json has neither
+    output = {}
+    for name, values in arrays.items():
+        if values.dtype.kind == 'M':
+            values = np.where(np.isnat(values), None, np.datetime_as_string(values))
+        elif values.dtype.kind == 'f':
+            values = np.where(np.isnan(values), None, values.astype(object))
+        output[name] = values.tolist()
+    return output
+
+
+def pack_series(arrays: Arrays) -> bytes | None:
+    # every array as little endian float32, one after another. only numeric series can be packed
+    if not all(values.dtype.kind in 'biuf' for values in arrays.values()):
+        return None
+    return b''.join(values.astype('<f4').tobytes() for values in arrays.values())
+
+
+@registry.series_for('line')
+@registry.series_for('area')
+def line_series(
+    source: DataFrame, x_col: str, y_col: list[str], figsize: tuple[int, int], decimate: bool, **_
+) -> Arrays:
+    x, y = source[x_col], source[y_col]
+    if decimate:
+        x, y = reduce_line(x, y, pixel_size(figsize))
+    return {'x': x.to_numpy(), **_y_arrays(y)}
+
+@registry.series_for('scatter')
+def scatter_series(
+    source: DataFrame, x_col: str, y_col: list[str], figsize: tuple[int, int], decimate: bool, **_
+) -> Arrays:
+    x, y = source[x_col], source[y_col]
+    if decimate:
+        x, y = reduce_scatter(x, y, pixel_size(figsize))
+    return {'x': x.to_numpy(), **_y_arrays(y)}
+
+@registry.series_for('bar')
+def bar_series(source: DataFrame, x_col: str, y_col: list[str], **_) -> Arrays:
+    return {'x': source[x_col].to_numpy(), **_y_arrays(source[y_col])}
+
+@registry.series_for('histogram')
+def histogram_series(source: DataFrame, column: str, bins: int, **_) -> Arrays:
+    counts, edges = np.histogram(source[column].dropna(), bins=bins)
+    return {'edges': edges, 'counts': counts}
+
+@registry.series_for('pie')
+def pie_series(source: DataFrame, column: str, **_) -> Arrays:
+    counts = source[column].value_counts()
+    return {'labels': counts.index.to_numpy(), 'counts': counts.to_numpy()}
+
+@registry.series_for('box')
+def box_series(source: DataFrame, x_col: str, y_col: str, **_) -> Arrays:
+    # the same summary matplotlib draws each box from, without the outliers
+    groups = [(label, values.dropna().to_numpy(dtype=float)) for label, values in source.groupby(x_col)[y_col]]
+    stats = [boxplot_stats(values)[0] if len(values) else {} for _, values in groups]
+    summary = {name: np.array([box.get(stat, np.nan) for box in stats], dtype=float)
+               for name, stat in [('low', 'whislo'), ('q1', 'q1'), ('median', 'med'), ('q3', 'q3'), ('high', 'whishi')]}
+    return {'labels': np.array([label for label, _ in groups]), **summary}
+
+
+def _y_arrays(y: DataFrame) -> Arrays:
+    # a single series is named y, while several are numbered in the order the spec gives their columns
+    arrays = [y.iloc[:, column].to_numpy() for column in range(y.shape[1])]
+    return {'y': arrays[0]} if len(arrays) == 1 else {f"y{index}": values for index, values in enumerate(arrays)}
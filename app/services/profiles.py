@@ -0,0 +1,23 @@
+from os import path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..models import DataProfile, File
+
+
+def ensure_profile(file: 'File') -> 'DataProfile | None':
+    # ingests the file's upload and records its profile, unless the blob already has one. this is called once the
+    # upload is stored and committed, so the commit here only ever saves the profile. unreadable uploads get none
+    from ..extensions import db
+    from ..models import DataProfile
+    from .data import ingest
+
+    profile = DataProfile.query.filter_by(storage_key=file.storage_key).first()
+    if profile is not None or not (file.storage_path and path.exists(file.storage_path)):
+        return profile
+
+    if (frame := ingest(file.storage_key, file.storage_path)) is None:
+        return None
+    profile = DataProfile.record(file.storage_key, frame)
+    db.session.commit()
+    return profile
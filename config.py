@@ -9,6 +9,30 @@ class Config:
     SECRET_KEY = getenv('FLASK_SECRET_KEY')
     IMAGE_FOLDER = path.join(basedir, 'app', 'static', 'chart_images')
     UPLOADS_FOLDER = path.join(basedir, 'app', 'uploads')
+    MAX_UPLOAD_BYTES = int(getenv('MAX_UPLOAD_BYTES', 512 * 1024 * 1024))
+    # leaves some room for the rest of the form around the file
+    MAX_CONTENT_LENGTH = MAX_UPLOAD_BYTES + 1024 * 1024
+    UPLOAD_CHUNK_BYTES = 64 * 1024
+    DATAFRAME_CACHE_BYTES = int(getenv('DATAFRAME_CACHE_BYTES', 256 * 1024 * 1024))
+    # uploads bigger than this are streamed in chunks by the plots that support it, rather than loaded whole
+    CHUNKED_RENDER_BYTES = int(getenv('CHUNKED_RENDER_BYTES', 128 * 1024 * 1024))
+    # charts are drawn in this many worker processes, so a slow one doesn't hold up other requests
+    RENDER_WORKERS = int(getenv('RENDER_WORKERS', 2))
+    RENDER_TIMEOUT = float(getenv('RENDER_TIMEOUT', 60))
+    RENDER_CACHE_FOLDER = path.join(basedir, 'app', 'render_cache')
+    RENDER_CACHE_BYTES = int(getenv('RENDER_CACHE_BYTES', 256 * 1024 * 1024))
+    # how long browsers may reuse a chart preview without checking back
+    PREVIEW_MAX_AGE = 10 * 60
+    # saved charts also get scaled down copies of these widths for dashboards, and webp copies where supported
+    CHART_THUMBNAIL_WIDTHS = (320, 640)
+    CHART_WEBP = True
+    # also saves an svg of every chart. off by default, since plots with many points make very large svgs
+    CHART_SVG = False
+    # runs render jobs as they are submitted rather than on a background thread
+    RENDER_JOBS_INLINE = False
+    # how many render jobs run at once. each spends most of its time waiting on a render worker, so by default
+    # there's one per worker
+    RENDER_JOB_THREADS = int(getenv('RENDER_JOB_THREADS', max(RENDER_WORKERS, 1)))
 
 
 class DeploymentConfig(Config):
@@ -20,3 +44,6 @@ class TestConfig(Config):
     SECRET_KEY = "very-secret-key"
     WTF_CSRF_ENABLED = False
     TESTING = True
+    RENDER_WORKERS = 0
+    RENDER_CACHE_FOLDER = None
+    RENDER_JOBS_INLINE = True
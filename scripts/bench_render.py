@@ -0,0 +1,66 @@
+# times every registered plotter the way charts used to be saved (a plain figure trimmed with bbox_inches='tight')
+# against the way they are now (laid out by MarginLayout in a warmed up process). run from the repository root with
+#   python scripts/bench_render.py [rows] [repeats]
+import sys
+from io import BytesIO
+from os import path
+from time import perf_counter
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+import numpy as np
+from pandas import DataFrame
+
+from app.services.plots import registry, warm_up
+
+
+def sample(rows: int) -> DataFrame:
+    generator = np.random.default_rng(0)
+    return DataFrame({
+        'x': np.arange(rows, dtype=float),
+        'y': np.cumsum(generator.normal(size=rows)),
+        'group': generator.choice(['a', 'b', 'c', 'd', 'e', 'f'], size=rows),
+    })
+
+
+def arguments(name: str) -> dict[str, str]:
+    columns = registry.functions[name].columns
+    if columns == ['column']:
+        return {'column': 'group' if name == 'pie' else 'y'}
+    return {'x_col': 'group' if name in ('bar', 'box') else 'x', 'y_col': 'y'}
+
+
+def time_render(name: str, frame: DataFrame, before: bool, repeats: int) -> float:
+    plotter = registry.functions[name]
+    bound, _ = plotter.bind_args(source=frame, **arguments(name))
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        fig = plotter.function(**bound)
+        with BytesIO() as buffer:
+            if before:
+                fig.set_layout_engine('none')
+                fig.savefig(buffer, format='png', bbox_inches='tight')
+            else:
+                fig.savefig(buffer, format='png')
+        times.append(perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def main(rows: int = 2000, repeats: int = 10) -> None:
+    start = perf_counter()
+    warm_up()
+    print(f"warm up: {(perf_counter() - start) * 1000:.1f} ms\n")
+
+    frame = sample(rows)
+    print(f"{'plotter':<12}{'before (ms)':>14}{'after (ms)':>14}{'change':>10}")
+    for name in registry.functions:
+        # bars draw one patch per row, which gets slow quickly, so they are given fewer
+        data = frame.iloc[:200] if name == 'bar' else frame
+        before = time_render(name, data, True, repeats)
+        after = time_render(name, data, False, repeats)
+        print(f"{name:<12}{before:>14.1f}{after:>14.1f}{(after - before) / before:>10.0%}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
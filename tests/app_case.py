@@ -0,0 +1,48 @@
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest import TestCase
+
+from app import create_app
+from app.extensions import db
+from app.models import User
+from app.services import frame_cache
+from config import TestConfig
+
+
+class AppTestCase(TestCase):
+    # a fresh app for every test, with an empty in-memory database and its uploads and images kept in a temporary
+    # folder. the app's context stays pushed for the whole test
+
+    def settings(self) -> dict[str, Any]:
+        # anything the tests of a subclass need configured differently. self.folder is already made
+        return {}
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+
+        class Config(TestConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+            UPLOADS_FOLDER = self.folder.name + '/uploads'
+            IMAGE_FOLDER = self.folder.name + '/images'
+
+        for name, value in self.settings().items():
+            setattr(Config, name, value)
+
+        self.app = create_app(Config)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        frame_cache.clear()
+
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        db.session.remove()
+        self.context.pop()
+        frame_cache.clear()
+        self.folder.cleanup()
+
+
+    def log_in(self, user: User) -> None:
+        with self.client.session_transaction() as session:
+            session['user_id'] = user.id
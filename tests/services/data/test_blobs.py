@@ -0,0 +1,92 @@
+from hashlib import sha256
+from io import BytesIO
+from os import listdir, path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from app.services.data.blobs import UploadError, UploadTooLarge, blob_digest, remove_blob, store_blob
+
+
+class TestBlobs(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+
+    def test_key_is_content_hash(self) -> None:
+        contents = b'a,b\n1,2\n'
+        key = store_blob(BytesIO(contents), self.folder.name)
+        self.assertEqual(sha256(contents).hexdigest() + '.csv', key)
+
+
+    def test_stores_contents(self) -> None:
+        key = store_blob(BytesIO(b'a,b\n1,2\n'), self.folder.name)
+        with open(path.join(self.folder.name, key), 'rb') as blob:
+            self.assertEqual(b'a,b\n1,2\n', blob.read())
+
+
+    def test_identical_uploads_share_a_blob(self) -> None:
+        first = store_blob(BytesIO(b'a,b\n1,2\n'), self.folder.name)
+        second = store_blob(BytesIO(b'a,b\n1,2\n'), self.folder.name)
+        self.assertEqual(first, second)
+        self.assertEqual([first], listdir(self.folder.name))
+
+
+    def test_different_uploads_get_different_blobs(self) -> None:
+        first = store_blob(BytesIO(b'a,b\n1,2\n'), self.folder.name)
+        second = store_blob(BytesIO(b'a,b\n3,4\n'), self.folder.name)
+        self.assertNotEqual(first, second)
+        self.assertEqual(2, len(listdir(self.folder.name)))
+
+
+    def test_remove_blob(self) -> None:
+        key = store_blob(BytesIO(b'a,b\n1,2\n'), self.folder.name)
+        remove_blob(self.folder.name, key)
+        self.assertEqual([], listdir(self.folder.name))
+
+
+    def test_rejects_oversized_uploads(self) -> None:
+        with self.assertRaises(UploadTooLarge):
+            store_blob(BytesIO(b'a,b\n' + b'1,2\n' * 100), self.folder.name, max_bytes=64, chunk_size=16)
+        self.assertEqual([], listdir(self.folder.name))
+
+
+    def test_accepts_uploads_at_the_limit(self) -> None:
+        contents = b'a,b\n1,2\n'
+        store_blob(BytesIO(contents), self.folder.name, max_bytes=len(contents))
+        self.assertEqual(1, len(listdir(self.folder.name)))
+
+
+    def test_finds_header_across_chunks(self) -> None:
+        key = store_blob(BytesIO(b'first,second,third\n1,2,3\n'), self.folder.name, chunk_size=4)
+        self.assertIn(key, listdir(self.folder.name))
+
+
+    def test_rejects_binary_uploads(self) -> None:
+        with self.assertRaises(UploadError):
+            store_blob(BytesIO(b'\x89PNG\r\n\x1a\n\x00\x00'), self.folder.name)
+        self.assertEqual([], listdir(self.folder.name))
+
+
+    def test_rejects_non_utf8_uploads(self) -> None:
+        with self.assertRaises(UploadError):
+            store_blob(BytesIO(b'caf\xe9,b\n1,2\n'), self.folder.name)
+
+
+    def test_rejects_empty_uploads(self) -> None:
+        with self.assertRaises(UploadError):
+            store_blob(BytesIO(b''), self.folder.name)
+
+
+    def test_digest_of_stored_blob(self) -> None:
+        contents = b'a,b\n1,2\n'
+        key = store_blob(BytesIO(contents), self.folder.name)
+        self.assertEqual(sha256(contents).hexdigest(), blob_digest(key))
+
+
+    def test_digest_of_older_uploads(self) -> None:
+        self.assertIsNone(blob_digest('0123abcd_data.csv'))
+        self.assertIsNone(blob_digest(None))
@@ -0,0 +1,64 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+
+from app.services.data.columnar import columns_path, read_columns, remove_columns, write_columns
+
+
+class TestColumnar(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.csv = path.join(self.folder.name, 'data.csv')
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+
+    def test_round_trips_numbers_and_strings(self) -> None:
+        frame = DataFrame({
+            'ints': [1, 2, 3],
+            'floats': [1.5, np.nan, 3.0],
+            'names': ['a', np.nan, 'a'],
+            'flags': [True, False, True],
+        })
+        self.assertTrue(write_columns(frame, self.csv, (1, 2)))
+        self.assertTrue(frame.equals(read_columns(self.csv, (1, 2))))
+
+
+    def test_round_trips_datetimes(self) -> None:
+        frame = DataFrame({'when': to_datetime(['2024-01-01', None, '2024-03-01 12:30'], format='ISO8601')})
+        self.assertTrue(write_columns(frame, self.csv, (1, 2)))
+        loaded = read_columns(self.csv, (1, 2))
+        self.assertTrue(frame.equals(loaded))
+        self.assertIsInstance(loaded['when'].to_numpy().base, np.memmap)
+
+
+    def test_numbers_are_memory_mapped(self) -> None:
+        write_columns(DataFrame({'a': [1.0, 2.0]}), self.csv, (1, 2))
+        loaded = read_columns(self.csv, (1, 2))
+        self.assertIsInstance(loaded['a'].to_numpy().base, np.memmap)
+
+
+    def test_stale_copy_is_ignored(self) -> None:
+        write_columns(DataFrame({'a': [1, 2]}), self.csv, (1, 2))
+        self.assertIsNone(read_columns(self.csv, (3, 4)))
+
+
+    def test_missing_copy_is_ignored(self) -> None:
+        self.assertIsNone(read_columns(self.csv, (1, 2)))
+
+
+    def test_refuses_mixed_columns(self) -> None:
+        self.assertFalse(write_columns(DataFrame({'a': [1, 'b']}), self.csv, (1, 2)))
+        self.assertFalse(path.exists(columns_path(self.csv)))
+
+
+    def test_remove_deletes_copy(self) -> None:
+        write_columns(DataFrame({'a': [1, 2]}), self.csv, (1, 2))
+        remove_columns(self.csv)
+        self.assertFalse(path.exists(columns_path(self.csv)))
+
@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from pandas import DataFrame
+
+from app.services.data.cache import FrameCache
+
+
+def make_frame(rows: int) -> DataFrame:
+    return DataFrame({'a': range(rows)})
+
+
+def frame_size(frame: DataFrame) -> int:
+    return int(frame.memory_usage(deep=True).sum())
+
+
+class TestFrameCache(TestCase):
+
+    def setUp(self) -> None:
+        self.loads = 0
+
+    def loader(self, frame: DataFrame):
+        def load() -> DataFrame:
+            self.loads += 1
+            return frame
+        return load
+
+
+    def test_hit_skips_loading(self) -> None:
+        cache = FrameCache()
+        frame = make_frame(10)
+        cache.get(1, 'v1', self.loader(frame))
+        self.assertIs(frame, cache.get(1, 'v1', self.loader(make_frame(10))))
+        self.assertEqual(1, self.loads)
+
+
+    def test_new_version_reloads(self) -> None:
+        cache = FrameCache()
+        cache.get(1, 'v1', self.loader(make_frame(10)))
+        replacement = make_frame(20)
+        self.assertIs(replacement, cache.get(1, 'v2', self.loader(replacement)))
+        self.assertEqual(2, self.loads)
+        self.assertEqual(frame_size(replacement), cache.size)
+
+
+    def test_invalidate_forces_reload(self) -> None:
+        cache = FrameCache()
+        cache.get(1, 'v1', self.loader(make_frame(10)))
+        cache.invalidate(1)
+        self.assertNotIn(1, cache)
+        self.assertEqual(0, cache.size)
+
+
+    def test_evicts_least_recently_used(self) -> None:
+        frame = make_frame(100)
+        cache = FrameCache(budget=frame_size(frame) * 2)
+        cache.get(1, 'v', self.loader(make_frame(100)))
+        cache.get(2, 'v', self.loader(make_frame(100)))
+        cache.get(1, 'v', self.loader(make_frame(100)))
+        cache.get(3, 'v', self.loader(make_frame(100)))
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertIn(3, cache)
+
+
+    def test_oversized_frames_are_not_cached(self) -> None:
+        cache = FrameCache(budget=10)
+        frame = make_frame(100)
+        self.assertIs(frame, cache.get(1, 'v', self.loader(frame)))
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+
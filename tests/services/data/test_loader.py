@@ -0,0 +1,95 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from app.services.data.cache import frame_cache
+from app.services.data.columnar import columns_path
+from app.services.data.loader import discard, file_version, ingest, iter_chunks, load_columns
+
+
+class TestLoader(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.csv = path.join(self.folder.name, 'blob.csv')
+        with open(self.csv, 'w') as file:
+            file.write('a,b,c\n1,x,2.5\n2,y,3.5\n')
+        frame_cache.clear()
+
+    def tearDown(self) -> None:
+        frame_cache.clear()
+        self.folder.cleanup()
+
+
+    def test_loads_only_requested_columns(self) -> None:
+        frame = load_columns('blob', self.csv, ['c', 'a'])
+        self.assertEqual(['c', 'a'], list(frame.columns))
+        self.assertEqual([2.5, 3.5], frame['c'].to_list())
+
+
+    def test_caches_columns_individually(self) -> None:
+        load_columns('blob', self.csv, ['a'])
+        self.assertIn(('blob', 'a'), frame_cache)
+        self.assertNotIn(('blob', 'b'), frame_cache)
+
+
+    def test_ingest_writes_columnar_copy_and_warms_cache(self) -> None:
+        ingest('blob', self.csv)
+        self.assertTrue(path.exists(columns_path(self.csv)))
+        self.assertIn(('blob', 'b'), frame_cache)
+
+
+    def test_reads_from_columnar_copy(self) -> None:
+        ingest('blob', self.csv)
+        frame_cache.clear()
+        frame = load_columns('blob', self.csv, ['b'])
+        self.assertEqual(['x', 'y'], frame['b'].to_list())
+
+
+    def test_missing_column_raises(self) -> None:
+        ingest('blob', self.csv)
+        frame_cache.clear()
+        with self.assertRaises(KeyError):
+            load_columns('blob', self.csv, ['nope'])
+
+
+    def test_discard_removes_everything(self) -> None:
+        ingest('blob.csv', self.csv)
+        discard('blob.csv', self.csv)
+        self.assertFalse(path.exists(self.csv))
+        self.assertFalse(path.exists(columns_path(self.csv)))
+        self.assertEqual(0, len(frame_cache))
+
+
+    def test_version_changes_with_contents(self) -> None:
+        before = file_version(self.csv)
+        with open(self.csv, 'a') as file:
+            file.write('3,z,4.5\n')
+        self.assertNotEqual(before, file_version(self.csv))
+
+
+    def test_iter_chunks_from_csv(self) -> None:
+        chunks = list(iter_chunks(self.csv, ['b'], rows=1))
+        self.assertEqual([['x'], ['y']], [chunk['b'].to_list() for chunk in chunks])
+
+
+    def test_iter_chunks_from_columnar_copy(self) -> None:
+        ingest('blob', self.csv)
+        chunks = list(iter_chunks(self.csv, ['a', 'b'], rows=1))
+        self.assertEqual([[1], [2]], [chunk['a'].to_list() for chunk in chunks])
+        self.assertEqual([['x'], ['y']], [chunk['b'].to_list() for chunk in chunks])
+
+
+    def test_iso_dates_are_parsed(self) -> None:
+        with open(self.csv, 'w') as file:
+            file.write('when,month,n\n2024-01-31,March,1\n2024-02-01T06:00:00+02:00,April,2\n,,3\n')
+        frame = ingest('blob', self.csv)
+        self.assertEqual('datetime64[ns]', str(frame['when'].dtype))
+        # offsets are converted to utc, and names that only look like dates are left alone
+        self.assertEqual('2024-02-01 04:00:00', str(frame['when'][1]))
+        self.assertEqual(object, frame['month'].dtype)
+
+        frame_cache.clear()
+        self.assertEqual('datetime64[ns]', str(load_columns('blob', self.csv, ['when'])['when'].dtype))
+        chunks = list(iter_chunks(self.csv, ['when'], rows=2))
+        self.assertEqual('datetime64[ns]', str(chunks[0]['when'].dtype))
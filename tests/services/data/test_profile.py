@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+
+from app.services.data.profile import column_kind, profile_column, profile_frame
+
+
+class TestProfile(TestCase):
+
+    def test_counts_rows(self) -> None:
+        self.assertEqual(3, profile_frame(DataFrame({'a': [1, 2, 3]}))['row_count'])
+
+
+    def test_keeps_column_order(self) -> None:
+        profile = profile_frame(DataFrame({'b': [1], 'a': [2]}))
+        self.assertEqual(['b', 'a'], [column['name'] for column in profile['columns']])
+
+
+    def test_kinds(self) -> None:
+        frame = DataFrame({'n': [1.5], 's': ['x'], 'd': to_datetime(['2025-01-01'])})
+        self.assertEqual('numeric', column_kind(frame['n']))
+        self.assertEqual('categorical', column_kind(frame['s']))
+        self.assertEqual('datetime', column_kind(frame['d']))
+
+
+    def test_numeric_column(self) -> None:
+        column = profile_column('a', DataFrame({'a': [3.0, np.nan, 1.0, 3.0]})['a'])
+        self.assertEqual({
+            'name': 'a', 'dtype': 'float64', 'kind': 'numeric', 'null_count': 1,
+            'minimum': '1.0', 'maximum': '3.0', 'cardinality': 2,
+        }, column)
+
+
+    def test_string_column(self) -> None:
+        column = profile_column('a', DataFrame({'a': ['pear', 'apple', None]})['a'])
+        self.assertEqual(('apple', 'pear'), (column['minimum'], column['maximum']))
+        self.assertEqual(1, column['null_count'])
+
+
+    def test_empty_column(self) -> None:
+        column = profile_column('a', DataFrame({'a': [np.nan, np.nan]})['a'])
+        self.assertIsNone(column['minimum'])
+        self.assertEqual(0, column['cardinality'])
+
@@ -0,0 +1,87 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from pandas import DataFrame, date_range
+
+from app.services.data.cache import frame_cache
+from app.services.plots.aggregate import aggregate_frame, load_aggregated
+from app.services.plots.plotters import plot_bar, registry
+from app.services.plots.registry import BindError, ColumnError
+
+
+class TestAggregate(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.csv = path.join(self.folder.name, 'blob.csv')
+        self.frame = DataFrame({
+            'x': ['a', 'b', 'a', 'b', 'a'], 'y': [1.0, 2.0, 3.0, 4.0, 5.0], 'k': ['p', 'p', 'q', 'q', 'q'],
+        })
+        self.frame.to_csv(self.csv, index=False)
+        frame_cache.clear()
+
+    def tearDown(self) -> None:
+        frame_cache.clear()
+        self.folder.cleanup()
+
+
+    def test_combines_rows_sharing_an_x(self) -> None:
+        frame = aggregate_frame(self.frame, 'x', ['y'], 'sum')
+        self.assertEqual(['a', 'b'], frame['x'].to_list())
+        self.assertEqual([9.0, 6.0], frame['y'].to_list())
+        self.assertEqual([3, 2], aggregate_frame(self.frame, 'x', ['y'], 'count')['y'].to_list())
+
+
+    def test_group_by_splits_series(self) -> None:
+        frame = aggregate_frame(self.frame, 'x', ['y'], 'max', group_by='k')
+        self.assertEqual(['x', 'k = p', 'k = q'], list(frame.columns))
+        self.assertEqual([1.0, 2.0], frame['k = p'].to_list())
+        self.assertEqual([5.0, 4.0], frame['k = q'].to_list())
+
+
+    def test_resamples_datetimes(self) -> None:
+        frame = DataFrame({'t': date_range('2024-01-01', periods=90, freq='D'), 'y': np.ones(90)})
+        monthly = aggregate_frame(frame, 't', ['y'], 'sum', resample='month')
+        self.assertEqual([31.0, 29.0, 30.0], monthly['y'].to_list())
+        with self.assertRaises(ValueError):
+            aggregate_frame(self.frame, 'x', ['y'], resample='month')
+
+
+    def test_stage_is_checked_against_column_kinds(self) -> None:
+        plotter = registry.functions['line']
+        kinds = {'t': 'datetime', 'x': 'numeric', 'y': 'numeric'}
+        plotter.check_columns({'x_col': 't', 'y_col': 'y', 'resample': 'day'}, kinds)
+        with self.assertRaises(ColumnError) as raised:
+            plotter.check_columns({'x_col': 'x', 'y_col': 'y', 'resample': 'day', 'group_by': 'x'}, kinds)
+        self.assertEqual(2, len(raised.exception.problems))
+
+
+    def test_plotters_draw_the_aggregate(self) -> None:
+        bars = plot_bar(self.frame, 'x', 'y', agg='mean').axes[0].patches
+        self.assertEqual([3.0, 3.0], [bar.get_height() for bar in bars])
+
+
+    def test_refuses_unknown_aggregates(self) -> None:
+        with self.assertRaises(BindError):
+            registry.functions['bar'].bind_args(source=None, x_col='x', y_col='y', agg='median')
+
+
+    def test_aggregate_is_cached_by_file_version(self) -> None:
+        plotter = registry.functions['bar']
+        bound, _ = plotter.bind_args(source=None, x_col='x', y_col='y', group_by='k')
+        columns = plotter.used_columns(bound)
+        first = load_aggregated('blob', self.csv, bound, columns)
+        self.assertEqual(['k = p', 'k = q'], first['y_col'])
+        self.assertIsNone(first['group_by'])
+
+        with patch('app.services.plots.aggregate.load_columns') as load:
+            second = load_aggregated('blob', self.csv, bound, columns)
+        load.assert_not_called()
+        self.assertIs(first['source'], second['source'])
+
+        with open(self.csv, 'a') as file:
+            file.write('a,10.0,p\n')
+        self.assertEqual([11.0, 2.0], load_aggregated('blob', self.csv, bound, columns)['source']['k = p'].to_list())
@@ -0,0 +1,79 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from pandas import DataFrame
+
+from app.services.plots.chunked import histogram_counts, value_counts
+from app.services.data.cache import frame_cache
+from app.services.plots.plotters import plot_histogram, plot_histogram_chunked, plot_pie, plot_pie_chunked
+from app.services.plots.render import render_figure
+
+
+def chunked(frame: DataFrame, rows: int):
+    return lambda: (frame.iloc[start:start + rows] for start in range(0, len(frame), rows))
+
+
+class TestChunked(TestCase):
+
+    def setUp(self) -> None:
+        generator = np.random.default_rng(0)
+        values = generator.normal(size=1000)
+        values[::50] = np.nan
+        self.frame = DataFrame({'n': values, 's': generator.choice(['a', 'b', 'c'], size=1000)})
+
+
+    def test_histogram_matches_whole_column(self) -> None:
+        counts, edges = histogram_counts(chunked(self.frame, 64), 'n', 12)
+        expected_counts, expected_edges = np.histogram(self.frame['n'].dropna(), bins=12)
+        np.testing.assert_array_equal(expected_counts, counts)
+        np.testing.assert_allclose(expected_edges, edges)
+
+
+    def test_histogram_refuses_strings(self) -> None:
+        self.assertIsNone(histogram_counts(chunked(self.frame, 64), 's', 10))
+
+
+    def test_histogram_of_empty_column(self) -> None:
+        counts, edges = histogram_counts(chunked(DataFrame({'n': [np.nan, np.nan]}), 1), 'n', 4)
+        self.assertEqual(0, counts.sum())
+        self.assertEqual(5, len(edges))
+
+
+    def test_value_counts_match_whole_column(self) -> None:
+        expected = self.frame['s'].value_counts()
+        counts = value_counts(chunked(self.frame, 64), 's')
+        self.assertEqual(expected.to_dict(), counts.to_dict())
+        self.assertEqual(expected.index.to_list(), counts.index.to_list())
+
+
+    def test_chunked_histogram_draws_same_bars(self) -> None:
+        whole = plot_histogram(self.frame, 'n', bins=12)
+        parts = plot_histogram_chunked(chunked(self.frame, 64), 'n', bins=12)
+        heights = lambda fig: [patch.get_height() for patch in fig.axes[0].patches]
+        self.assertEqual(heights(whole), heights(parts))
+
+
+    def test_chunked_pie_draws_same_wedges(self) -> None:
+        whole = plot_pie(self.frame, 's')
+        parts = plot_pie_chunked(chunked(self.frame, 64), 's')
+        angles = lambda fig: [(wedge.theta1, wedge.theta2) for wedge in fig.axes[0].patches]
+        self.assertEqual(angles(whole), angles(parts))
+
+
+
+    def test_big_files_are_drawn_in_chunks_without_facets(self) -> None:
+        # an empty facet_by is how the form and the api leave it unset, and the chunked plotters don't take it
+        with TemporaryDirectory() as folder:
+            csv = path.join(folder, 'blob.csv')
+            self.frame.to_csv(csv, index=False)
+            frame_cache.clear()
+            for spec in [{'graph_type': 'histogram', 'column': 'n'}, {'graph_type': 'pie', 'column': 's'}]:
+                for facet_by in [None, '']:
+                    with patch('app.services.plots.render.load_aggregated') as load:
+                        fig = render_figure(spec['graph_type'], {**spec, 'facet_by': facet_by}, 'blob', csv, 0)
+                    load.assert_not_called()
+                    self.assertEqual(1, len(fig.axes))
+            frame_cache.clear()
@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from app.services.plots.context import MarginLayout, new_figure, warm_up
+
+
+class TestContext(TestCase):
+
+    def test_figures_keep_their_size(self) -> None:
+        fig = new_figure((8, 4))
+        fig.add_subplot(1, 1, 1).set(title='Title', xlabel='x', ylabel='y')
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        self.assertEqual((800, 400), canvas.get_width_height())
+
+
+    def test_margins_leave_room_for_labels(self) -> None:
+        fig = new_figure((8, 4))
+        ax = fig.add_subplot(1, 1, 1)
+        FigureCanvasAgg(fig).draw()
+        left, bottom, right, top = ax.get_position().extents
+        self.assertTrue(0.05 < left < 0.2 and 0.05 < bottom < 0.3)
+        self.assertTrue(0.9 < right < 1 and 0.8 < top < 1)
+        self.assertIsInstance(fig.get_layout_engine(), MarginLayout)
+
+
+    def test_margins_are_capped_for_tiny_figures(self) -> None:
+        fig = new_figure((1, 1))
+        ax = fig.add_subplot(1, 1, 1)
+        FigureCanvasAgg(fig).draw()
+        self.assertGreater(ax.get_position().width, 0)
+
+
+    def test_warm_up_can_run_twice(self) -> None:
+        warm_up()
+        warm_up()
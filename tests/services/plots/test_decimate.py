@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import numpy as np
+from pandas import DataFrame
+
+from app.services.plots.decimate import minmax_indices, pixel_indices, reduce_line
+from app.services.plots.plotters import plot_area, plot_line, plot_scatter
+
+
+class TestDecimate(TestCase):
+
+    def setUp(self) -> None:
+        generator = np.random.default_rng(0)
+        self.frame = DataFrame({
+            'x': np.arange(200_000, dtype=float),
+            'y': np.cumsum(generator.normal(size=200_000)),
+        })
+
+
+    def test_minmax_keeps_extremes_of_every_bucket(self) -> None:
+        values = self.frame['y'].to_numpy()
+        keep = minmax_indices(values, 100)
+        for bucket in np.array_split(np.arange(len(values)), 100):
+            kept = np.intersect1d(keep, bucket)
+            self.assertIn(bucket[values[bucket].argmin()], kept)
+            self.assertIn(bucket[values[bucket].argmax()], kept)
+            self.assertIn(bucket[0], kept)
+            self.assertIn(bucket[-1], kept)
+        self.assertLessEqual(len(keep), 400)
+
+
+    def test_minmax_skips_nans(self) -> None:
+        values = np.array([np.nan, 1.0, 5.0, np.nan, -2.0, 3.0, np.nan, np.nan])
+        keep = minmax_indices(values, 2)
+        self.assertEqual([0, 1, 2, 3, 4, 5, 7], keep.tolist())
+
+
+    def test_pixel_indices_keeps_one_point_per_pixel(self) -> None:
+        x = np.array([0.0, 0.0, 1.0, 1.0, np.nan, 0.5])
+        y = np.array([0.0, 0.0, 1.0, 1.0, 0.2, np.inf])
+        self.assertEqual([0, 2], pixel_indices(x, y, 10, 10).tolist())
+
+
+    def test_line_draws_fewer_points_with_same_range(self) -> None:
+        fig = plot_line(self.frame, 'x', 'y')
+        drawn = fig.axes[0].lines[0].get_ydata()
+        self.assertLess(len(drawn), 4 * 1000 + 1)
+        self.assertEqual(self.frame['y'].min(), drawn.min())
+        self.assertEqual(self.frame['y'].max(), drawn.max())
+
+
+    def test_decimation_can_be_turned_off(self) -> None:
+        fig = plot_line(self.frame, 'x', 'y', decimate=False)
+        self.assertEqual(len(self.frame), len(fig.axes[0].lines[0].get_ydata()))
+
+
+    def test_small_plots_are_untouched(self) -> None:
+        small = self.frame.iloc[:500]
+        self.assertEqual(500, len(plot_line(small, 'x', 'y').axes[0].lines[0].get_ydata()))
+        self.assertEqual(500, len(plot_scatter(small, 'x', 'y').axes[0].collections[0].get_offsets()))
+
+
+    def test_scatter_and_area_are_reduced(self) -> None:
+        scatter = plot_scatter(self.frame, 'x', 'y').axes[0].collections[0].get_offsets()
+        self.assertLess(len(scatter), len(self.frame))
+        self.assertIsNotNone(plot_area(self.frame, 'x', 'y'))
+
+
+    def test_series_share_every_kept_point(self) -> None:
+        frame = self.frame.assign(z=-self.frame['y'] * 2)
+        x, y = reduce_line(frame['x'], frame[['y', 'z']], (100, 100))
+        for column in ['y', 'z']:
+            _, alone = reduce_line(frame['x'], frame[column], (100, 100))
+            self.assertTrue(set(alone.index) <= set(y.index))
+        self.assertEqual(len(x), len(y))
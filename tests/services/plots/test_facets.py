@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+import numpy as np
+from pandas import DataFrame
+
+from app.services.plots.facets import MAX_FACETS
+from app.services.plots.plotters import plot_histogram, plot_line, registry
+from app.services.plots.registry import ColumnError
+
+
+class TestFacets(TestCase):
+
+    def setUp(self) -> None:
+        generator = np.random.default_rng(0)
+        self.frame = DataFrame({
+            'x': np.arange(100), 'y': generator.normal(size=100), 'k': np.repeat(['a', 'b', 'c', 'd', 'e'], 20),
+        })
+
+
+    def visible(self, fig) -> list:
+        return [ax for ax in fig.axes if ax.get_visible()]
+
+
+    def test_draws_a_cell_for_each_value(self) -> None:
+        fig = plot_line(self.frame, 'x', 'y', title='Lines', facet_by='k')
+        axes = self.visible(fig)
+        self.assertEqual(5, len(axes))
+        self.assertEqual(6, len(fig.axes)) # a 3x2 grid, with the spares hidden
+        self.assertEqual(['k = a', 'k = b', 'k = c', 'k = d', 'k = e'], [ax.get_title() for ax in axes])
+        self.assertEqual(20, len(axes[0].lines[0].get_xdata()))
+        self.assertEqual('Lines', fig._suptitle.get_text())
+
+
+    def test_without_facets_draws_one_chart(self) -> None:
+        fig = plot_histogram(self.frame, 'y')
+        self.assertEqual(1, len(fig.axes))
+
+
+    def test_refuses_too_many_values(self) -> None:
+        with self.assertRaises(ValueError):
+            plot_line(self.frame, 'x', 'y', facet_by='x')
+        self.assertGreater(len(self.frame), MAX_FACETS)
+
+
+    def test_facet_column_is_a_column(self) -> None:
+        plotter = registry.functions['line']
+        args, errors = plotter.bind_args(source=None, x_col='x', y_col='y', facet_by='k')
+        self.assertEqual([], errors)
+        self.assertEqual(['x', 'y', 'k'], plotter.used_columns(args))
+        self.assertTrue(plotter.schema('line')['properties']['facet_by']['x-column'])
+
+
+    def test_facet_values_are_checked_against_the_profile(self) -> None:
+        plotter = registry.functions['line']
+        kinds = {'x': 'numeric', 'y': 'numeric', 'k': 'categorical'}
+        plotter.check_columns({'x_col': 'x', 'y_col': 'y', 'facet_by': 'k'}, kinds, {'k': 5})
+        with self.assertRaises(ColumnError):
+            plotter.check_columns({'x_col': 'x', 'y_col': 'y', 'facet_by': 'x'}, kinds, {'x': MAX_FACETS + 1})
@@ -0,0 +1,59 @@
+from io import BytesIO
+from os import listdir, path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from PIL import Image
+
+from app.services.plots.images import image_name, image_width, remove_renditions, save_renditions, webp_supported
+
+
+def png(width: int, height: int) -> bytes:
+    with BytesIO() as buffer:
+        Image.new('RGBA', (width, height), 'white').save(buffer, 'PNG')
+        return buffer.getvalue()
+
+
+class TestImages(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.image = png(1000, 600)
+        with open(path.join(self.folder.name, 'chart_1_abc.png'), 'wb') as file:
+            file.write(self.image)
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+
+    def test_image_names(self) -> None:
+        self.assertEqual('chart_1_abc_320w.webp', image_name('chart_1_abc.png', 320, 'webp'))
+        self.assertEqual('chart_1_abc.svg', image_name('chart_1_abc.png', format='svg'))
+
+
+    def test_reads_width_from_header(self) -> None:
+        self.assertEqual(1000, image_width(path.join(self.folder.name, 'chart_1_abc.png')))
+        self.assertIsNone(image_width(path.join(self.folder.name, 'missing.png')))
+
+
+    def test_saves_scaled_copies(self) -> None:
+        save_renditions(self.image, 'chart_1_abc.png', self.folder.name, (320, 2000), webp=False)
+        self.assertEqual(['chart_1_abc.png', 'chart_1_abc_320w.png'], sorted(listdir(self.folder.name)))
+        with Image.open(path.join(self.folder.name, 'chart_1_abc_320w.png')) as scaled:
+            self.assertEqual((320, 192), scaled.size)
+
+
+    def test_saves_webp_where_supported(self) -> None:
+        if not webp_supported():
+            self.skipTest('pillow was built without webp')
+        save_renditions(self.image, 'chart_1_abc.png', self.folder.name, (320,))
+        self.assertIn('chart_1_abc.webp', listdir(self.folder.name))
+        self.assertIn('chart_1_abc_320w.webp', listdir(self.folder.name))
+
+
+    def test_removes_every_rendition(self) -> None:
+        save_renditions(self.image, 'chart_1_abc.png', self.folder.name, (320,))
+        other = path.join(self.folder.name, 'chart_1_abcd.png')
+        open(other, 'wb').close()
+        remove_renditions('chart_1_abc.png', self.folder.name)
+        self.assertEqual(['chart_1_abcd.png'], listdir(self.folder.name))
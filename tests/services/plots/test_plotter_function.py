@@ -1,6 +1,7 @@
+from typing import Optional
 from unittest import TestCase
 
-from app.services.plots.registry import PlotterFunction, BindError
+from app.services.plots.registry import PlotterFunction, BindError, Column, ColumnError, ColumnName, NumericColumn
 
 
 class TestPlotterFunction(TestCase):
@@ -116,3 +117,104 @@ class TestPlotterFunction(TestCase):
             captured.list_args()
         )
 
+
+    def test_finds_columns(self) -> None:
+        def test_function(source, x: ColumnName, y: ColumnName, title: str = ''):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual(['x', 'y'], captured.columns)
+
+
+    def test_column_annotations_cast_as_strings(self) -> None:
+        def test_function(x: ColumnName):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual({'x': str}, captured.annotations)
+
+
+    def test_used_columns(self) -> None:
+        def test_function(x: ColumnName, y: ColumnName, z: ColumnName = '', title: str = ''):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual(['b', 'a'], captured.used_columns({'x': 'b', 'y': 'a', 'title': 'c'}))
+
+
+    def test_used_columns_skips_repeats(self) -> None:
+        def test_function(x: ColumnName, y: ColumnName):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual(['a'], captured.used_columns({'x': 'a', 'y': 'a'}))
+
+
+    def test_coerces_tuples_from_strings(self) -> None:
+        def test_function(figsize: tuple[int, int] = (10, 6)):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual({'figsize': (10, 6)}, captured.bind_args(figsize='10x6')[0])
+        self.assertEqual({'figsize': (8, 4)}, captured.bind_args(figsize=[8, '4'])[0])
+        with self.assertRaises(BindError):
+            captured.bind_args(figsize='10x6x2')
+
+
+    def test_coerces_bools(self) -> None:
+        def test_function(grid: bool = True):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual({'grid': False}, captured.bind_args(grid=False)[0])
+        self.assertEqual({'grid': False}, captured.bind_args(grid='False')[0])
+        self.assertEqual({'grid': True}, captured.bind_args(grid='yes')[0])
+        with self.assertRaises(BindError):
+            captured.bind_args(grid='maybe')
+
+
+    def test_optionals_keep_none(self) -> None:
+        def test_function(label: Optional[str] = None, size: int | None = None):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual({'label': None, 'size': 3}, captured.bind_args(label=None, size='3')[0])
+
+
+    def test_numbers_are_checked(self) -> None:
+        def test_function(a: int = 1, b: float = 1.0):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual({'a': 2, 'b': 2.5}, captured.bind_args(a='2.0', b=2.5)[0])
+        for args in [{'a': 2.5}, {'a': True}, {'b': 'nan'}]:
+            with self.assertRaises(BindError):
+                captured.bind_args(**args)
+
+
+    def test_schema(self) -> None:
+        def test_function(source, x: ColumnName, size: tuple[int, int] = (10, 6), label: Optional[str] = None):
+            ...
+        schema = PlotterFunction(test_function, {}).schema('test')
+        self.assertEqual('test', schema['title'])
+        self.assertEqual(['x'], schema['required'])
+        self.assertEqual({'type': 'string', 'x-column': True}, schema['properties']['x'])
+        self.assertEqual([10, 6], schema['properties']['size']['default'])
+        self.assertEqual([{'type': 'integer'}] * 2, schema['properties']['size']['prefixItems'])
+        self.assertEqual([{'type': 'string'}, {'type': 'null'}], schema['properties']['label']['anyOf'])
+        self.assertNotIn('source', schema['properties'])
+
+
+    def test_column_kinds(self) -> None:
+        def test_function(x: ColumnName, y: NumericColumn):
+            ...
+        captured = PlotterFunction(test_function, {})
+        self.assertEqual({'y': ('numeric',)}, captured.column_kinds)
+        self.assertEqual(['numeric'], captured.schema()['properties']['y']['x-column-kinds'])
+        self.assertRaises(ValueError, Column, 'numberish')
+
+
+    def test_check_columns(self) -> None:
+        def test_function(x: ColumnName, y: NumericColumn):
+            ...
+        captured = PlotterFunction(test_function, {})
+        kinds = {'a': 'categorical', 'b': 'numeric'}
+        captured.check_columns({'x': 'a', 'y': 'b'}, kinds)
+        with self.assertRaises(ColumnError) as context:
+            captured.check_columns({'x': 'missing', 'y': 'a'}, kinds)
+        self.assertEqual(
+            ["Column 'missing' not found.", "y must be a numeric column, but 'a' is categorical."],
+            context.exception.problems
+        )
@@ -0,0 +1,106 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from app.services.data.cache import frame_cache
+from app.services.plots.pool import RenderPool, RenderTimeout
+from app.services.plots.render import PlotJob
+from app.services.plots.registry import BindError
+
+PNG = b'\x89PNG\r\n\x1a\n'
+
+
+class TestRenderPool(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.csv = path.join(self.folder.name, 'blob.csv')
+        with open(self.csv, 'w') as file:
+            file.write('x,y\n1,2\n2,4\n3,9\n')
+        frame_cache.clear()
+
+    def tearDown(self) -> None:
+        frame_cache.clear()
+        self.folder.cleanup()
+
+
+    def job(self, **spec) -> PlotJob:
+        return PlotJob('line', {'x_col': 'x', 'y_col': 'y', **spec}, 'blob', self.csv)
+
+
+    def test_renders_inline_without_workers(self) -> None:
+        image = RenderPool(workers=0).render(self.job())
+        self.assertTrue(image.startswith(PNG))
+
+
+    def test_workers_render_the_same_image(self) -> None:
+        pool = RenderPool(workers=1, timeout=120)
+        try:
+            self.assertEqual(RenderPool().render(self.job()), pool.render(self.job()))
+        finally:
+            pool.shutdown()
+
+
+    def test_errors_come_back_from_workers(self) -> None:
+        pool = RenderPool(workers=1, timeout=120)
+        try:
+            with self.assertRaises(BindError):
+                pool.render(PlotJob('line', {'x_col': 'x'}, 'blob', self.csv))
+        finally:
+            pool.shutdown()
+
+
+    def test_slow_jobs_time_out(self) -> None:
+        # starting a fresh worker alone takes longer than this
+        pool = RenderPool(workers=1, timeout=0.001)
+        try:
+            with self.assertRaises(RenderTimeout):
+                pool.render(self.job())
+        finally:
+            pool.shutdown()
+
+
+    def test_concurrent_timeouts_restart_once(self) -> None:
+        pool = RenderPool(workers=2, timeout=0.001)
+        try:
+            with ThreadPoolExecutor(4) as threads:
+                futures = [threads.submit(pool.render, self.job(title=str(index))) for index in range(4)]
+            # losing a worker to another job's timeout doesn't end a job, only its own timeout does
+            for future in futures:
+                if (error := future.exception()) is not None:
+                    self.assertIsInstance(error, RenderTimeout)
+        finally:
+            pool.shutdown()
+
+
+    def test_jobs_outlive_other_jobs_timeouts(self) -> None:
+        broken, cancelled, done = Future(), Future(), Future()
+        broken.set_exception(BrokenProcessPool())
+        cancelled.cancel()
+        done.set_result(PNG)
+        pool = RenderPool(workers=1, timeout=0.01)
+        restarted = [Mock(), Mock()]
+        pool._timed_out.update(restarted)
+        submitted = iter([(broken, restarted[0]), (cancelled, restarted[1]), (broken, Mock()), (done, Mock())])
+        with patch.object(pool, '_submit', lambda job: next(submitted)), patch.object(pool, '_restart') as restart:
+            self.assertEqual(PNG, pool.render(self.job()))
+        # only the pool that broke by itself was restarted, and that was the job's one failure
+        self.assertEqual(1, restart.call_count)
+
+
+    def test_retried_jobs_still_time_out(self) -> None:
+        broken, stuck = Future(), Future()
+        broken.set_exception(BrokenProcessPool())
+        pool = RenderPool(workers=1, timeout=0.01)
+        executors = [Mock(), Mock(), Mock(), Mock()]
+        submitted = iter([(broken, executors[0]), (stuck, executors[1]), (broken, executors[2]), (broken, executors[3])])
+        with patch.object(pool, '_submit', lambda job: next(submitted)), patch.object(pool, '_restart') as restart:
+            with self.assertRaises(RenderTimeout):
+                pool.render(self.job())
+            # a pool breaking by itself twice in a row ends the job
+            with self.assertRaises(BrokenProcessPool):
+                pool.render(self.job())
+        self.assertEqual(executors, [call.args[0] for call in restart.call_args_list])
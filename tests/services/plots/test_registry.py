@@ -44,3 +44,13 @@ class TestPlotRegistry(TestCase):
         self.registry.register_as('test 2')(lambda x, y, z: x + y + z)
         self.assertEqual([{'name': 'x', 'required': 'true'}], self.registry.list_common_args())
 
+
+    def test_chunked_for_attaches_to_plotter(self) -> None:
+        self.registry.register_as('test')(lambda source: source)
+        chunked = lambda source: source
+        self.registry.chunked_for('test')(chunked)
+        self.assertIs(chunked, self.registry.functions['test'].chunked)
+
+
+    def test_chunked_for_requires_plotter(self) -> None:
+        self.assertRaises(RuntimeError, self.registry.chunked_for, 'test')
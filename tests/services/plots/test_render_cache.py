@@ -0,0 +1,77 @@
+from os import path, utime
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from app.services.data.cache import frame_cache
+from app.services.plots.pool import RenderPool
+from app.services.plots.plotters import registry
+from app.services.plots.render import PlotJob
+from app.services.plots.render_cache import RenderCache
+
+KEY = 'ab' * 32 + '.csv'
+
+
+class TestRenderCache(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.csv = path.join(self.folder.name, KEY)
+        with open(self.csv, 'w') as file:
+            file.write('x,y\n1,2\n2,4\n3,9\n')
+        self.cache = RenderCache(path.join(self.folder.name, 'renders'))
+        frame_cache.clear()
+
+    def tearDown(self) -> None:
+        frame_cache.clear()
+        self.folder.cleanup()
+
+
+    def job(self, key: str = KEY, **spec) -> PlotJob:
+        return PlotJob('line', {'graph_type': 'line', 'x_col': 'x', 'y_col': 'y', **spec}, key, self.csv)
+
+
+    def test_equivalent_specs_share_a_key(self) -> None:
+        key = self.cache.key_for(self.job())
+        self.assertEqual(key, self.cache.key_for(self.job(grid='True', title='Line Plot')))
+        self.assertNotEqual(key, self.cache.key_for(self.job(grid='False')))
+        self.assertNotEqual(key, self.cache.key_for(self.job(key='cd' * 32 + '.csv')))
+
+
+    def test_plotter_version_is_part_of_the_key(self) -> None:
+        key = self.cache.key_for(self.job())
+        with patch.object(registry.functions['line'], 'version', registry.functions['line'].version + 1):
+            self.assertNotEqual(key, self.cache.key_for(self.job()))
+
+
+    def test_uncacheable_jobs_have_no_key(self) -> None:
+        self.assertIsNone(self.cache.key_for(self.job(key='1.csv')))
+        self.assertIsNone(self.cache.key_for(PlotJob('line', {'x_col': 'x'}, KEY, self.csv)))
+        self.assertIsNone(RenderCache().key_for(self.job()))
+
+
+    def test_put_then_get(self) -> None:
+        self.cache.put('k' * 64, b'image')
+        self.assertEqual(b'image', self.cache.get('k' * 64))
+        self.assertIsNone(self.cache.get('j' * 64))
+
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = RenderCache(self.cache.folder, budget=25)
+        for age, key in enumerate(['a' * 64, 'b' * 64]):
+            cache.put(key, b'0123456789')
+            utime(cache._path(key), (age, age))
+        cache.get('a' * 64)
+        cache.put('c' * 64, b'0123456789')
+        self.assertIn('a' * 64, cache)
+        self.assertNotIn('b' * 64, cache)
+        self.assertIn('c' * 64, cache)
+
+
+    def test_pool_renders_unchanged_jobs_once(self) -> None:
+        pool = RenderPool(cache=self.cache)
+        with patch('app.services.plots.pool._draw', return_value=b'image') as render:
+            self.assertEqual(b'image', pool.render(self.job()))
+            self.assertEqual(b'image', pool.render(self.job(title='Line Plot')))
+            pool.render(self.job(title='Other'))
+        self.assertEqual(2, render.call_count)
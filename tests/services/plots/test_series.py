@@ -0,0 +1,106 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from pandas import DataFrame, read_csv
+
+from app.services.data.cache import frame_cache
+from app.services.plots.plotters import plot_bar, plot_histogram, plot_line
+from app.services.plots.registry import BindError, ColumnError
+from app.services.plots.series import pack_series, series_for_spec, series_to_json
+
+
+class TestSeries(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.csv = path.join(self.folder.name, 'blob.csv')
+        generator = np.random.default_rng(0)
+        DataFrame({
+            'x': np.arange(50_000),
+            'y': generator.normal(size=50_000),
+            'c': generator.choice(['a', 'b'], size=50_000),
+        }).to_csv(self.csv, index=False)
+        frame_cache.clear()
+
+    def tearDown(self) -> None:
+        frame_cache.clear()
+        self.folder.cleanup()
+
+
+    def series(self, graph_type: str, **spec):
+        return series_for_spec(graph_type, spec, 'blob', self.csv)
+
+
+    def test_line_series_match_what_is_drawn(self) -> None:
+        arrays, options = self.series('line', x_col='x', y_col='y', figsize=(8, 4))
+        drawn = plot_line(read_csv(self.csv), 'x', 'y', figsize=(8, 4)).axes[0].lines[0].get_xdata()
+        np.testing.assert_array_equal(drawn, arrays['x'])
+        self.assertEqual('Line Plot', options['title'])
+
+
+    def test_decimation_can_be_turned_off(self) -> None:
+        arrays, _ = self.series('line', x_col='x', y_col='y', decimate='false')
+        self.assertEqual(50_000, len(arrays['y']))
+
+
+    def test_histogram_series_match_bars(self) -> None:
+        arrays, _ = self.series('histogram', column='y', bins='7')
+        frame = DataFrame({'y': np.random.default_rng(0).normal(size=50_000)})
+        heights = [patch.get_height() for patch in plot_histogram(frame, 'y', bins=7).axes[0].patches]
+        self.assertEqual(7, len(arrays['counts']))
+        self.assertEqual(50_000, arrays['counts'].sum())
+        self.assertEqual(len(heights), len(arrays['counts']))
+
+
+    def test_pie_and_box_series(self) -> None:
+        pie, _ = self.series('pie', column='c')
+        self.assertEqual(['a', 'b'], sorted(pie['labels'].tolist()))
+        box, _ = self.series('box', x_col='c', y_col='y')
+        self.assertEqual(['a', 'b'], box['labels'].tolist())
+        self.assertTrue(np.all(box['low'] <= box['median']))
+
+
+    def test_specs_are_validated(self) -> None:
+        with self.assertRaises(BindError):
+            self.series('line', x_col='x')
+        # unknown columns are a KeyError from the columnar copy, or a ValueError from the csv
+        with self.assertRaises((KeyError, ValueError)):
+            self.series('line', x_col='x', y_col='missing')
+
+
+    def test_several_y_columns(self) -> None:
+        arrays, options = self.series('line', x_col='x', y_col=['y', 'x'])
+        self.assertEqual(['x', 'y0', 'y1'], list(arrays))
+        self.assertEqual(['y', 'x'], options['y_col'])
+        self.assertEqual(len(arrays['x']), len(arrays['y1']))
+
+        lines = plot_line(read_csv(self.csv), 'x', ['y', 'x']).axes[0].lines
+        self.assertEqual(['y', 'x'], [line.get_label() for line in lines])
+
+
+    def test_bars_of_several_series_are_grouped(self) -> None:
+        frame = DataFrame({'k': ['a', 'b', 'c'], 'y': [1, 2, 3], 'z': [3, 2, 1]})
+        ax = plot_bar(frame, 'k', ['y', 'z']).axes[0]
+        self.assertEqual(6, len(ax.patches))
+        self.assertEqual(['a', 'b', 'c'], [label.get_text() for label in ax.get_xticklabels()])
+
+
+    def test_column_kinds_are_checked_before_loading(self) -> None:
+        kinds = {'x': 'numeric', 'y': 'numeric', 'c': 'categorical'}
+        with patch('app.services.plots.aggregate.load_columns') as load, self.assertRaises(ColumnError):
+            series_for_spec('scatter', {'x_col': 'c', 'y_col': 'y'}, 'blob', self.csv, kinds=kinds)
+        load.assert_not_called()
+
+
+    def test_packs_numeric_series_as_float32(self) -> None:
+        packed = pack_series({'x': np.array([1, 2]), 'y': np.array([0.5, np.nan])})
+        np.testing.assert_array_equal(np.array([1, 2, 0.5, np.nan], dtype='<f4'), np.frombuffer(packed, '<f4'))
+        self.assertIsNone(pack_series({'labels': np.array(['a'])}))
+
+
+    def test_json_has_no_nans(self) -> None:
+        arrays = {'y': np.array([1.5, np.nan]), 'd': np.array(['2024-01-02', 'NaT'], dtype='datetime64[D]')}
+        self.assertEqual({'y': [1.5, None], 'd': ['2024-01-02', None]}, series_to_json(arrays))
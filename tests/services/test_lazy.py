@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+from app.services import data
+
+
+class TestLazyExports(TestCase):
+
+    def test_names_are_listed_before_they_are_imported(self) -> None:
+        self.assertIn('load_frame', dir(data))
+        self.assertIn('frame_cache', dir(data))
+
+
+    def test_imported_names_are_kept(self) -> None:
+        from app.services.data.loader import load_frame
+        self.assertIs(load_frame, data.load_frame)
+        self.assertIs(load_frame, vars(data)['load_frame'])
+
+
+    def test_unknown_names_raise(self) -> None:
+        with self.assertRaises(AttributeError):
+            data.nothing_here
@@ -0,0 +1,45 @@
+from flask import Response
+
+from app.caching import _cache_chart_images
+from app.extensions import db
+from app.models import File, User
+from app_case import AppTestCase
+
+
+class TestCaching(AppTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        user = User(fullname='A', email='a@b.com', password='x')
+        db.session.add_all([user, File(name='data.csv', owner=user)])
+        db.session.commit()
+        self.log_in(user)
+
+
+    def cache_control(self, url: str) -> str:
+        with self.app.test_request_context(url):
+            return _cache_chart_images(Response(b'image')).headers.get('Cache-Control', '')
+
+
+    def test_chart_images_are_immutable(self) -> None:
+        self.assertIn('immutable', self.cache_control('/static/chart_images/chart_3_0123456789abcdef_320w.webp'))
+        self.assertIn('max-age=31536000', self.cache_control('/static/chart_images/chart_3_0123abcd.png'))
+
+
+    def test_other_static_files_are_left_alone(self) -> None:
+        self.assertEqual('', self.cache_control('/static/css/input.css'))
+        self.assertEqual('', self.cache_control('/static/chart_images/notes.png'))
+
+
+    def test_listings_answer_conditional_requests(self) -> None:
+        response = self.client.get('/api/files/')
+        self.assertTrue(response.headers['ETag'].startswith('W/'))
+        self.assertIn('private', response.headers['Cache-Control'])
+
+        again = self.client.get('/api/files/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(304, again.status_code)
+
+        db.session.get(File, 1).name = 'renamed.csv'
+        db.session.commit()
+        changed = self.client.get('/api/files/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(200, changed.status_code)
@@ -0,0 +1,148 @@
+import json, os
+from io import BytesIO
+
+from app.extensions import db
+from app.models import Chart, DataProfile, File, User
+from app.services import ensure_profile, store_blob
+from app_case import AppTestCase
+
+
+class TestFiles(AppTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User(fullname='A', email='a@b.com', password='x')
+        db.session.add(self.user)
+        db.session.commit()
+        self.log_in(self.user)
+
+
+    def stored(self, contents: bytes) -> File:
+        key = store_blob(BytesIO(contents), self.app.config['UPLOADS_FOLDER'])
+        file = File(name='data.csv', owner=self.user, storage_key=key)
+        db.session.add(file)
+        db.session.commit()
+        return file
+
+
+    def test_uploads_are_profiled(self) -> None:
+        response = self.client.post('/api/files/', data={
+            'file': (BytesIO(b'x,y\n1,a\n2,b\n'), 'data.csv'), 'name': 'data.csv',
+        }, content_type='multipart/form-data')
+        self.assertEqual(201, response.status_code)
+
+        profile = db.session.get(File, response.get_json()['id']).profile
+        self.assertEqual({'x': 'numeric', 'y': 'categorical'}, profile.kinds)
+
+
+    def test_uploaded_dates_are_profiled_as_datetimes(self) -> None:
+        response = self.client.post('/api/files/', data={
+            'file': (BytesIO(b'when,y\n2024-01-01,1\n2024-01-02,2\n'), 'data.csv'), 'name': 'data.csv',
+        }, content_type='multipart/form-data')
+        kinds = db.session.get(File, response.get_json()['id']).profile.kinds
+        self.assertEqual('datetime', kinds['when'])
+
+        from app.services import registry
+        registry.functions['scatter'].check_columns({'x_col': 'when', 'y_col': ['y']}, kinds)
+
+
+    def test_uploaded_dates_can_be_resampled(self) -> None:
+        rows = b''.join(f'2024-{month:02}-{day:02},{day}\n'.encode() for month in (1, 2) for day in (1, 2, 3))
+        response = self.client.post('/api/files/', data={
+            'file': (BytesIO(b'when,y\n' + rows), 'data.csv'), 'name': 'data.csv',
+        }, content_type='multipart/form-data')
+        file_id = response.get_json()['id']
+
+        spec = {'graph_type': 'line', 'x_col': 'when', 'y_col': 'y', 'agg': 'sum', 'resample': 'month'}
+        series = self.client.post(f'/api/files/{file_id}/series', json=spec).get_json()['series']
+        self.assertEqual(['2024-01-01T00:00:00.000000000', '2024-02-01T00:00:00.000000000'], series['x'])
+        self.assertEqual([6, 6], series['y'])
+
+        created = self.client.post('/api/charts/', json={'name': 'c', 'file_id': file_id, 'spec': json.dumps(spec)})
+        self.assertEqual(201, created.status_code)
+        self.assertIsNotNone(created.get_json()['image_url'])
+
+        # resampling anything but dates is turned away before the chart is saved
+        spec['x_col'] = 'y'
+        refused = self.client.post('/api/charts/', json={'name': 'c', 'file_id': file_id, 'spec': json.dumps(spec)})
+        self.assertEqual(400, refused.status_code)
+        self.assertIn("resample needs a datetime x_col, but 'y' is numeric.", refused.get_json()['details'])
+        self.assertEqual(1, Chart.query.count())
+
+
+    def test_facets_with_too_many_values_are_refused(self) -> None:
+        rows = b''.join(f'{row},{row % 40}\n'.encode() for row in range(80))
+        response = self.client.post('/api/files/', data={
+            'file': (BytesIO(b'x,k\n' + rows), 'data.csv'), 'name': 'data.csv',
+        }, content_type='multipart/form-data')
+        spec = {'graph_type': 'histogram', 'column': 'x', 'facet_by': 'k'}
+
+        refused = self.client.post('/api/charts/', json={
+            'name': 'c', 'file_id': response.get_json()['id'], 'spec': json.dumps(spec),
+        })
+        self.assertEqual(400, refused.status_code)
+        self.assertIn("Can't facet by 'k', which has 40 values. At most 36 can be drawn.", refused.get_json()['details'])
+        self.assertEqual(0, Chart.query.count())
+
+
+    def test_series_of_missing_content_is_not_found(self) -> None:
+        spec = {'graph_type': 'line', 'x_col': 'x', 'y_col': 'y'}
+        unstored = File(name='data.csv', owner=self.user)
+        db.session.add(unstored)
+        db.session.commit()
+        gone = self.stored(b'x,y\n1,2\n')
+        os.remove(gone.storage_path)
+
+        for file in (unstored, gone):
+            response = self.client.post(f'/api/files/{file.id}/series', json=spec)
+            self.assertEqual(404, response.status_code)
+            self.assertEqual({'error': 'File content is missing.'}, response.get_json())
+
+
+    def test_reading_a_profile_doesnt_write(self) -> None:
+        file = self.stored(b'x,y\n1,2\n')
+        self.assertIsNone(file.profile)
+
+        # something else left pending in the session stays uncommitted
+        file.name = 'pending.csv'
+        self.assertIsNone(file.profile)
+        db.session.rollback()
+        self.assertEqual('data.csv', db.session.get(File, file.id).name)
+        self.assertEqual(0, DataProfile.query.count())
+
+
+    def test_ensure_profile_records_once(self) -> None:
+        file = self.stored(b'x,y\n1,2\n')
+        profile = ensure_profile(file)
+        self.assertEqual(['x', 'y'], profile.names)
+        self.assertEqual(profile.id, ensure_profile(file).id)
+        self.assertEqual(profile.id, file.profile.id)
+
+
+    def test_downloads_answer_range_requests(self) -> None:
+        file = self.stored(b'x,y\n1,2\n3,4\n')
+        response = self.client.get(f'/api/files/{file.id}/', headers={'Range': 'bytes=4-7'})
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(b'1,2\n', response.data)
+        self.assertEqual('bytes 4-7/12', response.headers['Content-Range'])
+
+
+    def test_downloads_use_the_content_hash_as_a_strong_etag(self) -> None:
+        file = self.stored(b'x,y\n1,2\n')
+        response = self.client.get(f'/api/files/{file.id}/')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(f'"{file.content_hash}"', response.headers['ETag'])
+        self.assertIn('private', response.headers['Cache-Control'])
+
+
+    def test_downloads_revalidate(self) -> None:
+        file = self.stored(b'x,y\n1,2\n')
+        etag = self.client.get(f'/api/files/{file.id}/').headers['ETag']
+        again = self.client.get(f'/api/files/{file.id}/', headers={'If-None-Match': etag})
+        self.assertEqual(304, again.status_code)
+        self.assertEqual(b'', again.data)
+
+        # a range asked for against a stale etag gets the whole file instead
+        stale = self.client.get(f'/api/files/{file.id}/', headers={'Range': 'bytes=0-1', 'If-Range': '"stale"'})
+        self.assertEqual(200, stale.status_code)
+        self.assertEqual(b'x,y\n1,2\n', stale.data)
@@ -0,0 +1,115 @@
+import json
+from io import BytesIO
+from unittest.mock import patch
+
+from app.extensions import db
+from app.jobs import JobQueue, job_queue
+from app.models import Chart, File, RenderJob, User
+from app.services import store_blob
+from app_case import AppTestCase
+
+
+class TestJobQueue(AppTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        user = User(fullname='A', email='a@b.com', password='x')
+        key = store_blob(BytesIO(b'x,y\n1,2\n2,4\n'), self.app.config['UPLOADS_FOLDER'])
+        self.file = File(name='data.csv', owner=user, storage_key=key)
+        db.session.add_all([user, self.file])
+        db.session.commit()
+        self.log_in(user)
+
+
+    def chart(self, **spec) -> Chart:
+        spec = {'graph_type': 'line', 'x_col': 'x', 'y_col': 'y', **spec}
+        chart = Chart(name='c', owner_id=self.file.owner_id, file_id=self.file.id, spec=json.dumps(spec))
+        db.session.add(chart)
+        db.session.commit()
+        return chart
+
+
+    def test_inline_job_renders_chart(self) -> None:
+        chart = self.chart()
+        queue = JobQueue()
+        queue.inline = True
+        job = queue.submit(chart)
+        self.assertEqual(RenderJob.DONE, job.status)
+        self.assertIsNotNone(chart.image_path)
+        with self.app.test_request_context():
+            self.assertIn('_320w.png 320w', chart.image_srcset())
+            self.assertIsNone(chart.image_src('svg'))
+
+
+    def test_failures_are_recorded(self) -> None:
+        queue = JobQueue()
+        queue.inline = True
+        job = queue.submit(self.chart(y_col='missing'))
+        self.assertEqual(RenderJob.FAILED, job.status)
+        self.assertIn('missing', job.error)
+
+
+    def test_jobs_only_run_once(self) -> None:
+        job = RenderJob(chart_id=self.chart().id, status=RenderJob.DONE)
+        db.session.add(job)
+        db.session.commit()
+        JobQueue().run(job.id)
+        self.assertIsNone(job.chart.image_path)
+
+
+    def test_queued_jobs_are_recovered(self) -> None:
+        chart = self.chart()
+        queued = RenderJob(chart_id=chart.id)
+        finished = RenderJob(chart_id=chart.id, status=RenderJob.DONE)
+        db.session.add_all([queued, finished])
+        db.session.commit()
+
+        queue = JobQueue()
+        queue._recover()
+        self.assertEqual([queued.id], list(queue._queue.queue))
+
+
+    def test_api_accepts_async_renders(self) -> None:
+        response = self.client.post('/api/charts/', headers={'Prefer': 'respond-async'}, json={
+            'name': 'c', 'file_id': self.file.id, 'spec': json.dumps({'graph_type': 'line', 'x_col': 'x', 'y_col': 'y'}),
+        })
+        self.assertEqual(202, response.status_code)
+
+        status = self.client.get(response.headers['Location']).get_json()
+        self.assertEqual('done', status['status'])
+        self.assertTrue(status['image_url'].endswith('.png'))
+
+
+    def test_batches_are_queued_together(self) -> None:
+        charts = [self.chart(), self.chart()]
+        queue = JobQueue()
+        with patch.object(queue, 'start'):
+            batch = queue.submit_all(charts)
+
+        jobs = RenderJob.query.filter_by(batch=batch).order_by(RenderJob.id).all()
+        self.assertEqual([chart.id for chart in charts], [job.chart_id for job in jobs])
+        self.assertEqual([job.id for job in jobs], list(queue._queue.queue))
+
+
+    def test_replacing_a_file_redraws_its_charts(self) -> None:
+        charts = [self.chart(), self.chart(graph_type='scatter')]
+        job_queue.submit_all(charts)
+        before = [chart.image_path for chart in charts]
+
+        response = self.client.put(f'/api/files/{self.file.id}/', data={
+            'file': (BytesIO(b'x,y\n1,5\n2,1\n3,7\n'), 'data.csv'),
+        }, content_type='multipart/form-data')
+        self.assertEqual(200, response.status_code)
+
+        progress = self.client.get(response.get_json()['renders']).get_json()
+        self.assertEqual((2, 2, 0, True), (progress['total'], progress['done'], progress['failed'], progress['finished']))
+        for chart, path in zip(charts, before):
+            db.session.refresh(chart)
+            self.assertNotEqual(path, chart.image_path)
+
+
+    def test_renaming_a_file_doesnt_redraw(self) -> None:
+        self.chart()
+        response = self.client.put(f'/api/files/{self.file.id}/', data={'name': 'renamed.csv'})
+        self.assertNotIn('renders', response.get_json())
+        self.assertEqual(0, RenderJob.query.count())
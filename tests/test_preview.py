@@ -0,0 +1,44 @@
+from io import BytesIO
+from typing import Any
+
+from app_case import AppTestCase
+
+
+class TestPreview(AppTestCase):
+
+    def settings(self) -> dict[str, Any]:
+        return {'RENDER_CACHE_FOLDER': self.folder.name + '/renders'}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.post('/signup', data={'name': 'A', 'email': 'a@b.com', 'password': 'password1', 'confirm': 'password1'})
+        self.client.post('/login', data={'email': 'a@b.com', 'password': 'password1'})
+        csv = b'x,y\n' + b''.join(f'{i},{i * i}\n'.encode() for i in range(20))
+        self.client.post('/generate-graph', data={'up-file': (BytesIO(csv), 'data.csv'), 'up-submit_upload': 'y'},
+                         content_type='multipart/form-data')
+
+
+    def preview_url(self) -> str:
+        response = self.client.post('/generate-graph', data={
+            'ch-graph_type': 'line', 'ch-x_col': 'x', 'ch-y_col': 'y', 'ch-figsize': '8x4', 'ch-submit_generate': 'y',
+        })
+        body = response.data.decode()
+        start = body.index('/preview/')
+        return body[start:body.index('"', start)]
+
+
+    def test_preview_is_served_with_an_etag(self) -> None:
+        response = self.client.get(self.preview_url())
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('image/png', response.mimetype)
+        self.assertIn('private', response.headers['Cache-Control'])
+        self.assertNotIn('no-store', response.headers['Cache-Control'])
+
+        again = self.client.get(self.preview_url(), headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(304, again.status_code)
+
+
+    def test_other_sessions_cannot_fetch_previews(self) -> None:
+        url = self.preview_url()
+        self.assertEqual(302, self.app.test_client().get(url).status_code)
+        self.assertEqual(404, self.client.get('/preview/' + '0' * 64 + '.png').status_code)
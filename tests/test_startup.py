@@ -0,0 +1,58 @@
+import json, subprocess, sys
+from os import path
+from unittest import TestCase
+
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib', 'PIL']
+IMPORT_BUDGET = 1.5 # seconds. without pandas and matplotlib the app starts in well under one
+
+# runs in a fresh interpreter, since this one has already imported everything the other tests needed
+STARTUP = '''
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+from config import TestConfig
+app = create_app(TestConfig)
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+'''
+
+# asks for a page and an api listing that don't draw anything
+REQUESTS = STARTUP + '''
+client = app.test_client()
+client.get('/login')
+client.get('/api/charts/')
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+'''
+
+
+def start(script: str) -> dict:
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+class TestStartup(TestCase):
+
+    def test_skips_heavy_imports(self) -> None:
+        modules = start(STARTUP)['modules']
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_pages_without_charts_skip_heavy_imports(self) -> None:
+        modules = start(REQUESTS)['modules']
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_within_budget(self) -> None:
+        # the best of a few runs, so a busy machine doesn't fail it
+        elapsed = min(start(STARTUP)['elapsed'] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+    def test_plotting_still_imports(self) -> None:
+        modules = start(STARTUP + '''
+from app.services import registry
+assert 'line' in registry.functions
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+''')['modules']
+        self.assertIn('matplotlib', modules)